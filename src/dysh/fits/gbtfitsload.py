@@ -1,10 +1,13 @@
 """Load SDFITS files produced by the Green Bank Telescope"""
 
-import copy
+import logging
+import threading
 import warnings
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import astropy.units as u
 import numpy as np
 import pandas as pd
 from astropy.io import fits
@@ -12,6 +15,7 @@ from astropy.io import fits
 from dysh.log import logger
 
 from ..coordinates import Observatory, decode_veldef
+from ..spectra.core import nod_calibrate
 from ..spectra.scan import FSScan, PSScan, ScanBlock, SubBeamNodScan, TPScan
 from ..util import consecutive, indices_where_value_changes, keycase, select_from, uniq
 from ..util.selection import Selection
@@ -29,6 +33,12 @@ calibration_kwargs = {
 # @todo what about the Track/OnOffOn in e.g. AGBT15B_287_33.raw.vegas  (EDGE HI data)
 _PROCEDURES = ["Track", "OnOff", "OffOn", "OffOnSameHA", "Nod", "SubBeamNod"]
 
+# Index DataFrames of files already loaded, keyed on (file path, modification time, size),
+# so re-opening an unchanged file does not re-read its binary tables to build the index.
+# Indices may be created in a thread pool, so the cache is only read or changed while holding its lock.
+_index_cache = {}
+_index_cache_lock = threading.Lock()
+
 
 class GBTFITSLoad(SDFITSLoad):
     """
@@ -44,8 +54,18 @@ class GBTFITSLoad(SDFITSLoad):
     hdu : int or list
         Header Data Unit to select from input file. Default: all HDUs
 
+    Notes
+    -----
+    The indices of the most recently loaded files are kept in a cache shared by all `GBTFITSLoad`
+    objects, so that loading an unchanged file again does not re-read its binary tables.
+    Each index holds every non-DATA column of its file, which can take hundreds of MB for large files,
+    and the cache keeps them after the `GBTFITSLoad` objects are gone. Set `GBTFITSLoad.index_cache_size`
+    to change how many indices are kept (0 disables the cache) and use :meth:`clear_cache` to free them.
     """
 
+    index_cache_size = 4
+    """The number of file indices kept in the cache shared by all `GBTFITSLoad` objects."""
+
     def __init__(self, fileobj, source=None, hdu=None, **kwargs):
         kwargs_opts = {
             "fix": False,  # fix non-standard header elements
@@ -56,19 +76,30 @@ class GBTFITSLoad(SDFITSLoad):
         path = Path(fileobj)
         self._sdf = []
         self._selection = None
+        # Whether this object was made by subselect, so only has some rows of its files.
+        self._subselected = False
         self.GBT = Observatory["GBT"]
+        # The per-file indices are created (or fetched from the cache) by _create_index_if_needed.
+        sdf_opts = dict(kwargs_opts, index=False)
         if path.is_file():
             logger.debug(f"Treating given path {path} as a file")
-            self._sdf.append(SDFITSLoad(fileobj, source, hdu, **kwargs_opts))
+            self._sdf.append(SDFITSLoad(fileobj, source, hdu, **sdf_opts))
         elif path.is_dir():
             logger.debug(f"Treating given path {path} as a directory")
             # Find all the FITS files in the directory and sort alphabetically
             # because e.g., VEGAS does A,B,C,D,E
-            for f in sorted(path.glob("*.fits")):
+            files = sorted(path.glob("*.fits"))
+            # Opening a file is mostly I/O, so the files can be opened concurrently.
+            # map() returns the results in the order of `files`. The threads finish in any order,
+            # so they do not print, and the messages are printed below in the order of `files`.
+            quiet_opts = dict(sdf_opts, verbose=False)
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(files)))) as executor:
+                self._sdf = list(executor.map(lambda f: SDFITSLoad(f, source, hdu, **quiet_opts), files))
+            for f in files:
                 logger.debug(f"Selecting {f} to load")
-                if kwargs.get("verbose", None):
+                if kwargs_opts["verbose"]:
                     print(f"doing {f}")
-                self._sdf.append(SDFITSLoad(f, source, hdu, **kwargs_opts))
+                    print("==SDFITSLoad %s" % f)
         else:
             raise Exception(f"{fileobj} is not a file or directory path")
         if kwargs_opts["index"]:
@@ -186,6 +217,12 @@ class GBTFITSLoad(SDFITSLoad):
             df = self._selection
         else:
             df = self._sdf[fitsindex]._index
+            if self._subselected:
+                # The files are shared with the GBTFITSLoad this was subselected from,
+                # so keep only the rows of the file that are in this one.
+                rows = self._selection[self._selection["FITSINDEX"] == fitsindex]
+                keys = ["BINTABLE", "ROW"]
+                df = df[pd.MultiIndex.from_frame(df[keys]).isin(pd.MultiIndex.from_frame(rows[keys]))]
 
         if hdu is None and bintable is None:
             return df
@@ -363,41 +400,28 @@ class GBTFITSLoad(SDFITSLoad):
             uncompressed_df = uncompressed_df.astype(col_dtypes)
             return uncompressed_df
         # do the work to compress the info
-        # in the dataframe on a scan basis
-        compressed_df = pd.DataFrame(columns=comp_colnames)
-        scanset = set(uncompressed_df["SCAN"])
-        avg_cols = ["SCAN", "VELOCITY", "PROCSEQN", "RESTFREQ", "DOPFREQ", "AZIMUTH", "ELEVATIO"]
-        for s in scanset:
-            uf = select_from("SCAN", s, uncompressed_df)
-            # for some columns we will display
-            # the mean value
-            ser = uf.filter(avg_cols).mean(numeric_only=True)
-            ser.rename("filtered ser")
-            # for others we will count how many there are
-            nIF = uf["IFNUM"].nunique()
-            nPol = uf["PLNUM"].nunique()
-            nfeed = uf["FEED"].nunique()
-            # For counting integrations, take care of out-of-sync samplers by just
-            # looking at the first instance of FEED, PLNUM, and IFNUM.
-            uf_int = select_from("FEED", uf["FEED"].iloc[0], uf)
-            uf_int = select_from("PLNUM", uf_int["PLNUM"].iloc[0], uf_int)
-            uf_int = select_from("IFNUM", uf_int["IFNUM"].iloc[0], uf_int)
-            nint = len(set(uf_int["DATE-OBS"]))  # see gbtidl io/line_index__define.pro
-            obj = list(set(uf["OBJECT"]))[0]  # We assume they are all the same!
-            proc = list(set(uf["PROC"]))[0]  # We assume they are all the same!
-            # print(f"Uniq data for scan {s}: {nint} {nIF} {nPol} {nfeed} {obj} {proc}")
-            s2 = pd.Series(
-                [obj, proc, nIF, nPol, nint, nfeed],
-                name="uniqued data",
-                index=["OBJECT", "PROC", "# IF", "# POL", "# INT", "# FEED"],
-            )
-            ser = pd.concat([ser, s2]).reindex(comp_colnames)
-            ser.rename("appended ser")
-            # print("append series data",ser)
-            # print("append series index ",ser.index)
-            # print("df cols",compressed_df.columns)
-            # print("SAME? ",all(ser.index == compressed_df.columns))
-            compressed_df = pd.concat([compressed_df, ser.to_frame().T], ignore_index=True)
+        # in the dataframe on a scan basis, with one groupby over all the scans.
+        bygroup = uncompressed_df.groupby("SCAN")
+        avg_cols = ["VELOCITY", "PROCSEQN", "RESTFREQ", "DOPFREQ", "AZIMUTH", "ELEVATIO"]
+        # for some columns we will display
+        # the mean value
+        compressed_df = bygroup[avg_cols].mean()
+        # for others we will count how many there are
+        nunique = bygroup[["IFNUM", "PLNUM", "FEED"]].nunique()
+        compressed_df["# IF"] = nunique["IFNUM"]
+        compressed_df["# POL"] = nunique["PLNUM"]
+        compressed_df["# FEED"] = nunique["FEED"]
+        # For counting integrations, take care of out-of-sync samplers by just
+        # looking at the first instance of FEED, PLNUM, and IFNUM.
+        fpi = ["FEED", "PLNUM", "IFNUM"]
+        first = bygroup[fpi].transform("first")
+        is_first = (uncompressed_df[fpi] == first).all(axis=1)
+        # see gbtidl io/line_index__define.pro
+        compressed_df["# INT"] = uncompressed_df[is_first].groupby("SCAN")["DATE-OBS"].nunique()
+        # We assume these are all the same within a scan!
+        compressed_df["OBJECT"] = bygroup["OBJECT"].first()
+        compressed_df["PROC"] = bygroup["PROC"].first()
+        compressed_df = compressed_df.reset_index()[comp_colnames].astype(object)
         compressed_df = compressed_df.astype(col_dtypes)
         if not show_index:
             print(compressed_df.to_string(index=False))
@@ -405,6 +429,37 @@ class GBTFITSLoad(SDFITSLoad):
         else:
             return compressed_df
 
+    def summary_per_feed(self, scan, ifnum=0, plnum=0, cols=None):
+        """
+        Get the first row of a scan for each feed, e.g., to compare the metadata of the beams
+        of a multi-beam receiver.
+
+        Parameters
+        ----------
+        scan : int
+            The scan number.
+        ifnum : int
+            The IF number. Default: 0
+        plnum : int
+            The polarization number. Default: 0
+        cols : list of str or None
+            The columns to return. Default: None, meaning all columns
+
+        Returns
+        -------
+        summary - `~pandas.DataFrame`
+            The first row of the scan for each FEED, in order of appearance.
+
+        """
+        self._create_index_if_needed()
+        df = self._index
+        mask = (df["SCAN"].to_numpy() == scan) & (df["IFNUM"].to_numpy() == ifnum) & (df["PLNUM"].to_numpy() == plnum)
+        # One pass over the selected rows, instead of selecting each feed in turn.
+        df = df[mask].groupby("FEED", sort=False).head(1)
+        if cols is not None:
+            df = df[[c.upper() for c in cols]]
+        return df
+
     def velocity_convention(self, veldef):
         """Given the GBT VELDEF FITS string return the specutils
         velocity convention, e.g., "doppler_radio"
@@ -524,6 +579,7 @@ class GBTFITSLoad(SDFITSLoad):
         None.
 
         """
+        self._selection.select_within(tag=tag, **kwargs)
 
     def select_channel(self, chan, tag=None):
         """
@@ -556,22 +612,106 @@ class GBTFITSLoad(SDFITSLoad):
         """
         self._selection.select_channel(tag=tag, chan=chan)
 
+    def subselect(self, **kwargs):
+        """
+        Create a new `GBTFITSLoad` containing only the rows matching the given
+        exact selection(s), e.g., `subselect(scan=[62,63], fdnum=2)`.
+        Any current selection rules of this object are also applied. A channel selection,
+        either of this object or given as `channel`, is kept in the new object.
+        This is equivalent to writing the selected rows with :meth:`write` and loading
+        the new file, but no file is written or read: the new object shares the
+        loaded data of this one. Consequently, changes made to data values through
+        either object (e.g., ``sdf["OBJECT"] = "NGC1234"``) are seen by both.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Selection keyword arguments, given as key=value as in :meth:`select`.
+
+        Returns
+        -------
+        sdf : `GBTFITSLoad`
+            A GBTFITSLoad with an index containing only the selected rows.
+
+        """
+        self._create_index_if_needed()
+        if len(self._selection._selection_rules) > 0:
+            df = self._selection.final
+        else:
+            df = self._index
+        # Apply the new rules to a fresh Selection so they cannot be
+        # mistaken for duplicates of any existing rule.
+        selection = Selection(df)
+        selection._select_from_mixed_kwargs(**kwargs)
+        if len(selection._selection_rules) > 0:
+            df = selection.final
+        elif len(keycase(kwargs).keys() - {"CHANNEL", "TAG"}) > 0:
+            raise Exception("Your selection rules resulted in no data being selected.")
+        sub = GBTFITSLoad.__new__(GBTFITSLoad)
+        sub._sdf = self._sdf
+        sub.GBT = self.GBT
+        sub._selection = Selection(df.reset_index(drop=True))
+        sub._subselected = True
+        # Channel selections do not select rows, so they are carried over as rules.
+        # As for a single Selection, there can only be one channel selection.
+        if self._selection._channel_selection is not None:
+            sub._selection.select_channel(self._selection._channel_selection)
+        if selection._channel_selection is not None:
+            sub._selection.select_channel(selection._channel_selection, tag=keycase(kwargs).get("TAG"))
+        return sub
+
+    @staticmethod
+    def clear_cache():
+        """Clear the cache of SDFITS file indices shared by all `GBTFITSLoad` objects, freeing their memory."""
+        with _index_cache_lock:
+            _index_cache.clear()
+
+    def _create_sdf_index(self, sdf):
+        """
+        Create the index of an `SDFITSLoad`, reusing a copy of the index built
+        the last time the same file was loaded if the file has not changed since.
+
+        Parameters
+        ----------
+        sdf : `~dysh.fits.sdfitsload.SDFITSLoad`
+            The SDFITSLoad for which to create the index.
+
+        """
+        path = Path(sdf.filename).resolve()
+        st = path.stat()
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with _index_cache_lock:
+            cached = _index_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Using cached index for {path}")
+            sdf._index = cached.copy()
+            return
+        # The index is created outside the lock, so files are still indexed in parallel.
+        sdf.create_index()
+        size = self.index_cache_size
+        if size <= 0:
+            return
+        index = sdf._index.copy()
+        with _index_cache_lock:
+            _index_cache.pop(key, None)
+            # evict the oldest entries, also if the size was lowered
+            while len(_index_cache) >= size:
+                _index_cache.pop(next(iter(_index_cache)))
+            _index_cache[key] = index
+
     def _create_index_if_needed(self):
         if self._selection is not None:
             return
-        i = 0
-        df = None
-        if self._selection is None:
-            for s in self._sdf:
-                if s._index is None:
-                    s.create_index()
-                # add a FITSINDEX column
-                s._index["FITSINDEX"] = i * np.ones(len(s._index), dtype=int)
-                if df is None:
-                    df = s._index
-                else:
-                    df = pd.concat([df, s._index], axis=0, ignore_index=True)
-                i = i + 1
+        need_index = [s for s in self._sdf if s._index is None]
+        if len(need_index) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(need_index))) as executor:
+                list(executor.map(self._create_sdf_index, need_index))
+        elif len(need_index) == 1:
+            self._create_sdf_index(need_index[0])
+        for i, s in enumerate(self._sdf):
+            # add a FITSINDEX column
+            s._index["FITSINDEX"] = i * np.ones(len(s._index), dtype=int)
+        df = pd.concat([s._index for s in self._sdf], axis=0, ignore_index=True)
         self._selection = Selection(df)
         self._construct_procedure()
         self._construct_integration_number()
@@ -743,11 +883,12 @@ class GBTFITSLoad(SDFITSLoad):
             if k not in kwargs:
                 kwargs[k] = v
         logger.debug("scans/w sel:", scans, self._selection)
-        fs_selection = copy.deepcopy(self._selection)
+        fs_selection = self._selection._copy_rules()
         # now downselect with any additional kwargs
         logger.debug(f"SELECTION FROM MIXED KWARGS {kwargs}")
         fs_selection._select_from_mixed_kwargs(**kwargs)
-        logger.debug(fs_selection.show())
+        if logger.isEnabledFor(logging.DEBUG):
+            fs_selection.show()
         _sf = fs_selection.final
         if len(_sf) == 0:
             raise Exception("Didn't find any scans matching the input selection criteria.")
@@ -864,7 +1005,7 @@ class GBTFITSLoad(SDFITSLoad):
         # now remove any scans that have been pre-selected by the user.
         # scans_to_add -= scans_preselected
         logger.debug(f"after removing preselected {preselected['SCAN']}, scans_to_add={scans_to_add}")
-        ps_selection = copy.deepcopy(self._selection)
+        ps_selection = self._selection._copy_rules()
         logger.debug("SCAN ", scans)
         logger.debug("TYPE: ", type(ps_selection))
         if len(scans_to_add) != 0:
@@ -876,10 +1017,12 @@ class GBTFITSLoad(SDFITSLoad):
                 kwargs[k] = v
         # now downselect with any additional kwargs
         logger.debug(f"SELECTION FROM MIXED KWARGS {kwargs}")
-        logger.debug(ps_selection.show())
+        if logger.isEnabledFor(logging.DEBUG):
+            ps_selection.show()
         ps_selection._select_from_mixed_kwargs(**kwargs)
         logger.debug("AFTER")
-        logger.debug(ps_selection.show())
+        if logger.isEnabledFor(logging.DEBUG):
+            ps_selection.show()
         _sf = ps_selection.final
         if len(_sf) == 0:
             raise Exception("Didn't find any scans matching the input selection criteria.")
@@ -1003,7 +1146,7 @@ class GBTFITSLoad(SDFITSLoad):
             preselected[kw] = uniq(_final[kw])
         if scans is None:
             scans = preselected["SCAN"]
-        ps_selection = copy.deepcopy(self._selection)
+        ps_selection = self._selection._copy_rules()
         for k, v in preselected.items():
             if k not in kwargs:
                 kwargs[k] = v
@@ -1018,13 +1161,17 @@ class GBTFITSLoad(SDFITSLoad):
         logger.debug(f"FINAL i {ifnum} p {plnum} s {scans} f {feeds}")
         scanblock = ScanBlock()
         calrows = {}
+        # Find the rows of every (file, IF, scan) in one pass, rather than
+        # filtering the selection again for each combination.
+        groups = _sf.groupby(["FITSINDEX", "IFNUM", "SCAN"], sort=False).indices
         # @todo loop over feeds too?
         for i in range(len(self._sdf)):
-            df = select_from("FITSINDEX", i, _sf)
             for k in ifnum:
-                _ifdf = select_from("IFNUM", k, df)
                 for scan in scans:
-                    df = select_from("SCAN", scan, _ifdf)
+                    rows = groups.get((i, k, scan))
+                    if rows is None:
+                        continue
+                    df = _sf.iloc[rows]
                     dfcalT = select_from("CAL", "T", df)
                     dfcalF = select_from("CAL", "F", df)
                     calrows["ON"] = list(dfcalT["ROW"])
@@ -1061,6 +1208,47 @@ class GBTFITSLoad(SDFITSLoad):
             raise Exception("Didn't find any scans matching the input selection criteria.")
         return scanblock
 
+    def getnod(self, scans, fdnums, ifnum=0, plnum=0, weights="tsys", **kwargs):
+        """
+        Combine the total power data of a pair of nodding scans.
+        In the first scan the first feed is on source and in the second scan the second feed is.
+        Each feed's off source data is used as its reference, and the result is
+        the average of `(sig-ref)/ref` for both feeds.  It is not scaled by the system temperature.
+
+        Parameters
+        ----------
+        scans : 2-tuple of int
+            The scan numbers of the nodding pair.
+        fdnums : 2-tuple of int
+            The feed numbers of the nodding pair.
+        ifnum : int
+            The IF number to use. Default: 0
+        plnum : int
+            The polarization number to use. Default: 0
+        weights: str or None
+            None or 'tsys' to indicate equal weighting or tsys weighting to use in time averaging. Default: 'tsys'
+        **kwargs : dict
+            Optional additional selection keyword arguments passed to :meth:`gettp`.
+
+        Returns
+        -------
+        spectrum : `~spectra.spectrum.Spectrum`
+            The combined spectrum.
+
+        """
+        if len(scans) != 2 or len(fdnums) != 2:
+            raise ValueError("You must give exactly two scans and two feeds for nodding data.")
+
+        def _tp(scan, fdnum):
+            return self.gettp(scan=scan, fdnum=fdnum, ifnum=ifnum, plnum=plnum, **kwargs).timeaverage(weights=weights)
+
+        sig1 = _tp(scans[0], fdnums[0])
+        ref1 = _tp(scans[1], fdnums[0])
+        sig2 = _tp(scans[1], fdnums[1])
+        ref2 = _tp(scans[0], fdnums[1])
+        data = nod_calibrate(sig1.flux.value, ref1.flux.value, sig2.flux.value, ref2.flux.value)
+        return sig1._copy(flux=data * u.dimensionless_unscaled, unit=None)
+
     # @todo sig/cal no longer needed?
     def subbeamnod(
         self,
@@ -1142,7 +1330,7 @@ class GBTFITSLoad(SDFITSLoad):
             elif kwargs["FDNUM"] == 1:
                 kwargs["PLNUM"] = 0
         # now downselect with any additional kwargs
-        ps_selection = copy.deepcopy(self._selection)
+        ps_selection = self._selection._copy_rules()
         ps_selection._select_from_mixed_kwargs(**kwargs)
         _sf = ps_selection.final
         ifnum = uniq(_sf["IFNUM"])
@@ -1738,35 +1926,27 @@ class GBTFITSLoad(SDFITSLoad):
         selection = Selection(self._index)
         if len(kwargs) > 0:
             selection._select_from_mixed_kwargs(**kwargs)
-            logger.debug(selection.show())
+            if logger.isEnabledFor(logging.DEBUG):
+                selection.show()
             _final = selection.final
         else:
             _final = selection
         if len(_final) == 0:
             raise Exception("Your selection resulted in no rows to be written")
-        fi = list(set(_final["FITSINDEX"]))
+        fi = np.unique(_final["FITSINDEX"].to_numpy())
         logger.debug(f"fitsindex {fi} ")
         total_rows_written = 0
         if multifile:
             count = 0
             for k in fi:
-                this_rows_written = 0
                 # copy the primary HDU
                 hdu = self._sdf[k]._hdu[0].copy()
                 outhdu = fits.HDUList(hdu)
                 # get the bintables rows as new bintables.
-                df = select_from("FITSINDEX", k, _final)
-                bintables = list(set(df.BINTABLE))
-                for b in bintables:
-                    rows = list(set(df.ROW))
-                    lr = len(rows)
-                    if lr > 0:
-                        ob = self._sdf[k]._bintable_from_rows(rows, b)
-                        # print(f"bintable {b} #rows {len(rows[i])} data length {len(ob.data)}")
-                        if len(ob.data) > 0:
-                            outhdu.append(ob)
-                        total_rows_written += lr
-                        this_rows_written += lr
+                bintables, this_rows_written = self._bintables_from_selection(k, _final)
+                for ob in bintables:
+                    outhdu.append(ob)
+                total_rows_written += this_rows_written
                 if len(fi) > 1:
                     p = Path(fileobj)
                     # Note this will not preserve "A","B" etc suffixes in original FITS files.
@@ -1781,19 +1961,13 @@ class GBTFITSLoad(SDFITSLoad):
             if verbose:
                 print(f"Total of {total_rows_written} rows written to files.")
         else:
-            hdu = self._sdf[fi[0]]._hdu[fi[0]].copy()
+            hdu = self._sdf[fi[0]]._hdu[0].copy()
             outhdu = fits.HDUList(hdu)
             for k in fi:
-                df = select_from("FITSINDEX", k, _final)
-                bintables = list(set(df.BINTABLE))
-                for b in bintables:
-                    rows = list(set(df.ROW))
-                    lr = len(rows)
-                    if lr > 0:
-                        ob = self._sdf[k]._bintable_from_rows(rows, b)
-                        if len(ob.data) > 0:
-                            outhdu.append(ob)
-                        total_rows_written += lr
+                bintables, this_rows_written = self._bintables_from_selection(k, _final)
+                for ob in bintables:
+                    outhdu.append(ob)
+                total_rows_written += this_rows_written
             if total_rows_written == 0:  # shouldn't happen, caught earlier
                 raise Exception("Your selection resulted in no rows to be written")
             else:
@@ -1803,6 +1977,38 @@ class GBTFITSLoad(SDFITSLoad):
             outhdu.writeto(fileobj, output_verify=output_verify, overwrite=overwrite, checksum=checksum)
             outhdu.close()
 
+    def _bintables_from_selection(self, fitsindex, df):
+        """
+        Create new bintables holding the rows of one SDFITS file that are in a selection.
+
+        Parameters
+        ----------
+        fitsindex : int
+            The index of the SDFITS file in this `GBTFITSLoad`.
+        df : `~pandas.DataFrame`
+            The selected rows of the index.
+
+        Returns
+        -------
+        bintables : list of `~astropy.io.fits.BinTableHDU`
+            One bintable per input bintable with selected rows, with the rows in file order.
+        nrows : int
+            The total number of rows in `bintables`.
+        """
+        inthisfile = df["FITSINDEX"].to_numpy() == fitsindex
+        bintable = df["BINTABLE"].to_numpy()[inthisfile]
+        row = df["ROW"].to_numpy()[inthisfile]
+        bintables = []
+        nrows = 0
+        for b in np.unique(bintable):
+            # ROW counts from zero within each bintable.
+            rows = np.unique(row[bintable == b])
+            ob = self._sdf[fitsindex]._bintable_from_rows(rows, b)
+            if len(ob.data) > 0:
+                bintables.append(ob)
+            nrows += len(rows)
+        return bintables, nrows
+
     def _update_radesys(self):
         """
         Updates the 'RADESYS' column of the index for cases when it is empty.
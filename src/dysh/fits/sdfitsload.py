@@ -144,10 +144,7 @@ class SDFITSLoad(object):
         self._index = None
         for i in ldu:
             # Create a DataFrame without the data column.
-            df = pd.DataFrame(np.lib.recfunctions.drop_fields(self._hdu[i].data, "DATA"))
-            # Select columns that are strings, decode them and remove white spaces.
-            df_obj = df.select_dtypes(["object"])
-            df[df_obj.columns] = df_obj.apply(lambda x: x.str.decode("utf-8").str.strip())
+            df = self._index_columns(self._hdu[i].data)
             # --- this doesn't actually work how we want---
             # convert them to actual string types because FITS will want that later.
             # This doe
@@ -165,6 +162,40 @@ class SDFITSLoad(object):
                 self._index = pd.concat([self._index, df], axis=0)
         self._add_primary_hdu()
 
+    def _index_columns(self, data):
+        """
+        Create a DataFrame of all columns of a binary table except DATA.
+
+        The records are overlaid with a structured dtype view that omits the DATA field.
+        This avoids `~numpy.lib.recfunctions.drop_fields`, which copies every row into a new
+        record array before pandas copies it again.
+
+        Parameters
+        ----------
+            data : ~astropy.io.fits.FITS_rec
+                The binary table data.
+
+        Returns
+        -------
+            df : ~pandas.DataFrame
+                The non-DATA columns of `data`.
+        """
+        names = [n for n in data.dtype.names if n != "DATA"]
+        df = pd.DataFrame(data.view(np.ndarray)[names])
+        # Columns that FITS_rec converts on access (strings, logicals, bits, variable length
+        # arrays and scaled integers) must come from the FITS_rec, which also holds any
+        # values assigned since the file was opened.
+        for c in data.columns:
+            if c.name == "DATA":
+                continue
+            if c.format.format == "A":
+                # Strings are decoded by FITS_rec, so only the white spaces need removing.
+                # This is done on the whole column at once rather than element by element in pandas.
+                df[c.name] = np.char.strip(np.asarray(data.field(c.name))).astype(object)
+            elif c.format.format in ("L", "X", "P", "Q") or c.bzero is not None or c.bscale is not None:
+                df[c.name] = np.asarray(data.field(c.name))
+        return df
+
     def _add_primary_hdu(self):
         """
         Add the columns to the index for header keywords that are not in primary header or not in the DATA column.
@@ -207,6 +238,7 @@ class SDFITSLoad(object):
         self._bintable = []
         self._binheader = []
         self._nrows = []
+        self._data_views = {}
         # fix = kwargs.get("fix")
 
         if hdu is not None:
@@ -349,7 +381,7 @@ class SDFITSLoad(object):
         Returns:
             tuple of ints (bintable, row)
         """
-        return (self._index.iloc[row]["BINTABLE"], self._index.iloc[row]["ROW"])
+        return (self._index["BINTABLE"].iat[row], self._index["ROW"].iat[row])
 
     def rawspectra(self, bintable):
         """
@@ -366,7 +398,31 @@ class SDFITSLoad(object):
                 The DATA column of the input bintable
 
         """
-        return self._bintable[bintable].data[:]["DATA"]
+        return self._data_view(bintable)
+
+    def _data_view(self, bintable):
+        """
+        The DATA column of a bintable, fetched from astropy once and reused by later calls.
+
+        Parameters
+        ----------
+            bintable :  int
+                The index of the `bintable` attribute
+
+        Returns
+        -------
+            data : ~numpy.ndarray
+                The DATA column of the input bintable
+        """
+        # Use the HDU's own FITS_rec (not a slice of it) so that any scaled
+        # DATA column is converted only once. The view is keyed on the FITS_rec
+        # because adding or removing columns replaces it.
+        data = self._bintable[bintable].data
+        cached = self._data_views.get(bintable)
+        if cached is None or cached[0] is not data:
+            cached = (data, data["DATA"])
+            self._data_views[bintable] = cached
+        return cached[1]
 
     def rawspectrum(self, i, bintable=0):
         """
@@ -387,9 +443,9 @@ class SDFITSLoad(object):
         """
         if bintable is None:
             (bt, row) = self._find_bintable_and_row(i)
-            return self._bintable[bt].data[:]["DATA"][row]
+            return self._data_view(bt)[row]
         else:
-            return self._bintable[bintable].data[:]["DATA"][i]
+            return self._data_view(bintable)[i]
 
     def getrow(self, i, bintable=0):
         """
@@ -612,10 +668,10 @@ class SDFITSLoad(object):
         # ensure it is a list if int was given
         if type(rows) == int:
             rows = [rows]
-        outbintable = self._bintable[bintable].copy()
-        # print(f"bintable copy data length {len(outbintable.data)}")
-        outbintable.data = outbintable.data[rows]
-        # print(f"bintable rows data length {len(outbintable.data)}")
+        # Only copy the selected rows. Copying the whole HDU first
+        # would duplicate every row of the DATA column just to throw most of it away.
+        inbintable = self._bintable[bintable]
+        outbintable = BinTableHDU(data=inbintable.data[rows], header=inbintable.header.copy())
         outbintable.update()
         return outbintable
 
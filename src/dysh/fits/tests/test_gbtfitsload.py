@@ -290,6 +290,18 @@ class TestGBTFITSLoad:
             == 0
         )
 
+    def test_gettp_multiple_ifnum(self):
+        """
+        Test that gettp returns one TPScan per IF when several IFs are in the same file.
+        """
+        sdf_file = f"{self.data_dir}/AGBT20B_014_03.raw.vegas/AGBT20B_014_03.raw.vegas.A6.fits"
+        sdf = gbtfitsload.GBTFITSLoad(sdf_file)
+        sb = sdf.gettp(scan=6, plnum=0)
+        assert len(sb) == 4
+        for k, tp in enumerate(sb):
+            one = sdf.gettp(scan=6, ifnum=k, plnum=0)[0]
+            assert np.array_equal(tp._data, one._data, equal_nan=True)
+
     def test_load_multifits(self):
         """
         Loading multiple SDFITS files under a directory.
@@ -317,6 +329,43 @@ class TestGBTFITSLoad:
         assert len(fdnums) == 1
         assert np.sum(np.subtract(fdnums, [0])) == 0
 
+    def test_index_cache(self, tmp_path):
+        """
+        Test that re-loading an unchanged file reuses its index, and that
+        changes to one GBTFITSLoad do not leak into another through the cache.
+        """
+        gbtfitsload.GBTFITSLoad.clear_cache()
+        data_file = util.get_project_testdata() / "AGBT20B_014_03.raw.vegas/AGBT20B_014_03.raw.vegas.A6.fits"
+        g1 = gbtfitsload.GBTFITSLoad(data_file)
+        assert len(gbtfitsload._index_cache) == 1
+        g2 = gbtfitsload.GBTFITSLoad(data_file)
+        assert len(gbtfitsload._index_cache) == 1
+        assert_frame_equal(g1._index, g2._index)
+        g2["OBJECT"] = "NGC1234"
+        g3 = gbtfitsload.GBTFITSLoad(data_file)
+        assert set(g3["OBJECT"]) == set(g1["OBJECT"])
+        # A file written to a new path gets its own entry.
+        out = tmp_path / "test_index_cache.fits"
+        g2.write(out, overwrite=True)
+        g4 = gbtfitsload.GBTFITSLoad(out)
+        assert len(gbtfitsload._index_cache) == 2
+        assert set(g4["OBJECT"]) == set(["NGC1234"])
+        gbtfitsload.GBTFITSLoad.clear_cache()
+        assert len(gbtfitsload._index_cache) == 0
+        # The cache can be limited or turned off.
+        size = gbtfitsload.GBTFITSLoad.index_cache_size
+        try:
+            gbtfitsload.GBTFITSLoad.index_cache_size = 1
+            gbtfitsload.GBTFITSLoad(data_file)
+            gbtfitsload.GBTFITSLoad(out)
+            assert len(gbtfitsload._index_cache) == 1
+            gbtfitsload.GBTFITSLoad.clear_cache()
+            gbtfitsload.GBTFITSLoad.index_cache_size = 0
+            gbtfitsload.GBTFITSLoad(data_file)
+            assert len(gbtfitsload._index_cache) == 0
+        finally:
+            gbtfitsload.GBTFITSLoad.index_cache_size = size
+
     # @pytest.mark.skip(reason="We need to update this to work with multifits and ScanBlocks")
     def test_multifits_getps_offon(self):
         """
@@ -394,6 +443,21 @@ class TestGBTFITSLoad:
                 check_index=False,
             )
 
+    def test_summary_per_feed(self):
+        """Test that `summary_per_feed` returns the first row of each feed in a scan."""
+        f = util.get_project_testdata() / "TGBT17A_506_11/TGBT17A_506_11.raw.vegas.A_truncated_rows.fits"
+        g = gbtfitsload.GBTFITSLoad(f)
+        scan = g["SCAN"].iloc[0]
+        ifnum = g["IFNUM"].iloc[0]
+        plnum = g["PLNUM"].iloc[0]
+        df = g.summary_per_feed(scan, ifnum=ifnum, plnum=plnum, cols=["feed", "scan", "date-obs"])
+        assert list(df.columns) == ["FEED", "SCAN", "DATE-OBS"]
+        sel = g._index[(g["SCAN"] == scan) & (g["IFNUM"] == ifnum) & (g["PLNUM"] == plnum)]
+        assert list(df["FEED"]) == list(pd.unique(sel["FEED"]))
+        for _, row in df.iterrows():
+            first = sel[sel["FEED"] == row["FEED"]].iloc[0]
+            assert row["DATE-OBS"] == first["DATE-OBS"]
+
     def test_contruct_integration_number(self):
         """Test that construction of integration number (intnum) during FITS load matches
         that in the GBTIDL index file
@@ -447,6 +511,21 @@ class TestGBTFITSLoad:
         # assert set(t._index["INT"]) == set([2])  # this exists because GBTIDL wrote it
         assert set(t._index["INTNUM"]) == set([2])
 
+    def test_write_multiple_bintables(self, tmp_path):
+        "Test that writing a subselection only writes the selected rows of each bintable"
+        f = util.get_project_testdata() / "TGBT17A_506_11/TGBT17A_506_11.raw.vegas.A_truncated_rows.fits"
+        g = gbtfitsload.GBTFITSLoad(f)
+        o = tmp_path / "sub"
+        o.mkdir()
+        for multifile in [True, False]:
+            out = o / f"test_write_bintables_{multifile}.fits"
+            g.write(out, multifile=multifile, ifnum=0, overwrite=True)
+            t = gbtfitsload.GBTFITSLoad(out)
+            expected = g._index[g._index["IFNUM"] == 0]
+            assert len(t._index) == len(expected)
+            assert set(t["IFNUM"]) == set([0])
+            assert np.all(t._index["DATE-OBS"].to_numpy() == expected["DATE-OBS"].to_numpy())
+
     def test_write_multi_file(self, tmp_path):
         "Test that writing multiple SDFITS files works, including subselection of data"
         f = util.get_project_testdata() / "AGBT18B_354_03/AGBT18B_354_03.raw.vegas/"
@@ -460,6 +539,57 @@ class TestGBTFITSLoad:
         sdf = gbtfitsload.GBTFITSLoad(o)
         assert set(sdf["SCAN"]) == set([6])
 
+    def test_subselect(self, tmp_path):
+        "Test that subselect gives the same result as writing the selected data and loading it"
+        f = util.get_project_testdata() / "AGBT18B_354_03/AGBT18B_354_03.raw.vegas/"
+        g = gbtfitsload.GBTFITSLoad(f)
+        sub = g.subselect(scan=6, ifnum=[0, 1])
+        assert set(sub["SCAN"]) == set([6])
+        assert set(sub["IFNUM"]) == set([0, 1])
+        assert len(g._index) == 128  # parent is unchanged
+        # The index of each file only has the selected rows.
+        sub_file_index = [sub.index(fitsindex=i) for i in range(len(sub._sdf))]
+        assert sum(len(df) for df in sub_file_index) == len(sub._index)
+        assert all(set(df["SCAN"]) <= set([6]) for df in sub_file_index)
+        assert g.index(fitsindex=0) is g._sdf[0]._index
+        o = tmp_path / "sub"
+        o.mkdir()
+        g.write(o / "testsubselect.fits", multifile=True, scan=6, ifnum=[0, 1], overwrite=True)
+        sdf = gbtfitsload.GBTFITSLoad(o)
+        assert len(sub._index) == len(sdf._index)
+        ta = sub.gettp(scan=6, ifnum=0, plnum=0).timeaverage()
+        tb = sdf.gettp(scan=6, ifnum=0, plnum=0).timeaverage()
+        assert np.all(ta.flux == tb.flux)
+        with pytest.raises(Exception):
+            g.subselect(scan=9999)
+        # Channel selections are kept, whether made before or in the subselection.
+        sub = g.subselect(scan=6, channel=[[10, 20]])
+        assert sub._selection._channel_selection == [[10, 20]]
+        g.select_channel([1, 2])
+        assert g.subselect(scan=6)._selection._channel_selection == [1, 2]
+        with pytest.raises(Exception):
+            g.subselect(scan=6, channel=[3])
+
+    def test_select_within(self):
+        "Test that select_within adds a selection rule"
+        sdf = gbtfitsload.GBTFITSLoad(util.get_project_testdata() / "TGBT21A_501_11/testselection.fits")
+        sdf.select_within(elevation=(18.0, 2))
+        assert len(sdf.selection.final) == 13
+
+    def test_getnod(self):
+        """Test that `getnod` combines the four total power spectra of a nodding pair."""
+        f = util.get_project_testdata() / "AGBT18B_354_03/AGBT18B_354_03.raw.vegas/"
+        g = gbtfitsload.GBTFITSLoad(f)
+        # This data set has a single feed, which is enough to check the arithmetic.
+        nod = g.getnod(scans=(6, 7), fdnums=(0, 0), ifnum=0, plnum=0)
+        a = g.gettp(scan=6, ifnum=0, plnum=0, fdnum=0).timeaverage()
+        b = g.gettp(scan=7, ifnum=0, plnum=0, fdnum=0).timeaverage()
+        expected = 0.5 * ((a - b) / b + (b - a) / a)
+        assert np.nanmax(np.abs(nod.flux.value - expected.flux.value)) < 1e-12
+        assert nod.meta["SCAN"] == 6
+        with pytest.raises(ValueError):
+            g.getnod(scans=(6, 7, 8), fdnums=(0, 0))
+
     def test_write_all(self, tmp_path):
         """Test that we can write a loaded SDFITS file without any changes"""
         p = util.get_project_testdata() / "AGBT20B_014_03.raw.vegas"
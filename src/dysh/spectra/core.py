@@ -3,6 +3,7 @@ Core functions for spectral data.
 """
 
 import warnings
+from functools import lru_cache
 
 import astropy.units as u
 import numpy as np
@@ -15,7 +16,6 @@ from astropy.convolution import (
 from astropy.modeling.fitting import LevMarLSQFitter, LinearLSQFitter
 from astropy.modeling.polynomial import Chebyshev1D, Hermite1D, Legendre1D, Polynomial1D
 from specutils import SpectralRegion
-from specutils.fitting import fit_continuum
 
 from ..coordinates import veltofreq
 from ..util import minimum_string_match, powerof2
@@ -28,7 +28,8 @@ def average(data, axis=0, weights=None):
     Parameters
     ----------
     data : `~numpy.ndarray`
-        The spectral data, typically with shape (nspect,nchan).
+        The spectral data, typically with shape (nspect,nchan). This should be a 2D numeric array,
+        like the `_calibrated` and `_data` arrays of the Scan classes, not an array of arrays.
     axis : int
         The axis over which to average the data.  Default axis=0 will return the average spectrum
         if shape is (nspect,nchan)
@@ -51,11 +52,27 @@ def average(data, axis=0, weights=None):
     #    return np.nan
     # Find indices that have any spectra with all channels = NaN
     # badindices = np.where(np.isnan(data).all(axis=1))
-    goodindices = find_non_blanks(data)
-    if weights is not None:
-        return np.average(data[goodindices], axis, weights[goodindices])
+    blanks = integration_isnan(data)
+    # If nothing is blanked, average in place instead of copying out the good rows.
+    if blanks.any():
+        goodindices = np.where(~blanks)
+        data = data[goodindices]
+        if weights is not None:
+            weights = weights[goodindices]
+    if weights is None or np.ndim(data) != 2 or np.ndim(weights) != 1 or axis != 0:
+        return np.average(data, axis, weights)
+    # The weighted average of a group of spectra is one matrix-vector product,
+    # which does not need an (nspect,nchan) temporary array like np.average does.
+    wsum = np.sum(weights)
+    if wsum == 0:
+        raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+    avg = np.dot(weights, data)
+    if avg.dtype.kind == "f":
+        avg /= wsum
     else:
-        return np.average(data[goodindices], axis, weights)
+        # Integer data and weights give an integer product, which cannot be divided in place.
+        avg = avg / wsum
+    return avg
 
 
 def integration_isnan(data):
@@ -72,8 +89,15 @@ def integration_isnan(data):
     blanks : `~numpy.ndarray`
         Array with length nspect with value True where an integration is blanked.
     """
-
-    return np.isnan(data).all(axis=1)
+    data = np.asarray(data)
+    if data.shape[-1] == 0:
+        return np.isnan(data).all(axis=1)
+    # A blanked integration has all of its channels set to NaN, so only the integrations
+    # with a NaN in the first channel have to be checked in full.
+    blanks = np.isnan(data[:, 0])
+    if blanks.any():
+        blanks[blanks] = np.isnan(data[blanks]).all(axis=1)
+    return blanks
 
 
 def find_non_blanks(data):
@@ -337,6 +361,9 @@ def baseline(spectrum, order, exclude=None, **kwargs):
         # exist (they will be a list of SpectralRegions or None)
         regionlist = p._exclude_regions
     print(f"EXCLUDING {regionlist}")
+    # specutils.fitting pulls in scipy.signal, so only import it when a baseline is fit.
+    from specutils.fitting import fit_continuum
+
     return fit_continuum(spectrum=p, model=selected_model, fitter=fitter, exclude_regions=regionlist)
 
 
@@ -346,6 +373,9 @@ def mean_tsys(calon, caloff, tcal, mode=0, fedge=0.1, nedge=None):
     We define an extra way to set the edge size, nedge, if you prefer to use
     number of edge channels instead of the inverse fraction.  This implementation recreates GBTIDL's `dcmeantsys`.
 
+    `calon` and `caloff` can also be 2D arrays of shape (nspect, nchan), in which case the
+    system temperature of every integration is computed at once.
+
     Parameters
     ----------
         calon : `~numpy.ndarray`-like
@@ -354,8 +384,8 @@ def mean_tsys(calon, caloff, tcal, mode=0, fedge=0.1, nedge=None):
         caloff  :  `~numpy.ndarray`-like
             OFF calibration
 
-        tcal  :  `~numpy.ndarray`-like
-            calibration temperature
+        tcal  :  float or `~numpy.ndarray`-like
+            calibration temperature. For 2D `calon` and `caloff` this can be an array with one value per integration.
 
         mode : int
             mode=0  Do the mean before the division
@@ -370,10 +400,10 @@ def mean_tsys(calon, caloff, tcal, mode=0, fedge=0.1, nedge=None):
     Returns
     -------
         meanTsys : `~numpy.ndarray`-like
-            The mean system temperature
+            The mean system temperature. An array with one value per integration for 2D `calon` and `caloff`.
     """
     # @todo Pedro thinks about a version that takes a spectrum with multiple SpectralRegions to exclude.
-    nchan = len(calon)
+    nchan = np.shape(calon)[-1]
     if nedge is None:
         nedge = int(nchan * fedge)
     # Python uses exclusive array ranges while GBTIDL uses inclusive ones.
@@ -381,18 +411,24 @@ def mean_tsys(calon, caloff, tcal, mode=0, fedge=0.1, nedge=None):
     # below in order to reproduce exactly what GBTIDL gets for Tsys.
     # See github issue #28.
     # Define the channel range once.
-    chrng = slice(nedge, -(nedge - 1), 1)
+    # The channel axis is the last one, so this works for a single spectrum
+    # and for a 2D array of integrations.
+    chrng = (Ellipsis, slice(nedge, -(nedge - 1), 1))
 
     # Make them doubles. Probably not worth it.
-    caloff = caloff.astype("d")
-    calon = calon.astype("d")
+    # Only the channels in range are converted, and `astype` always copies,
+    # so the ON-OFF difference can be formed in place without touching the inputs.
+    caloff = np.asarray(caloff)[chrng].astype("d")
+    calon = np.asarray(calon)[chrng].astype("d")
+    tcal = np.asarray(tcal, dtype="d")
+    calon -= caloff
 
     if mode == 0:  # mode = 0 matches GBTIDL output for Tsys values
-        meanoff = np.nanmean(caloff[chrng])
-        meandiff = np.nanmean(calon[chrng] - caloff[chrng])
+        meanoff = np.nanmean(caloff, axis=-1)
+        meandiff = np.nanmean(calon, axis=-1)
         meanTsys = meanoff / meandiff * tcal + tcal / 2.0
     else:
-        meanTsys = np.nanmean(caloff[chrng] / (calon[chrng] - caloff[chrng]))
+        meanTsys = np.nanmean(caloff / calon, axis=-1)
         meanTsys = meanTsys * tcal + tcal / 2.0
 
     # meandiff can sometimes be negative, which makes Tsys negative!
@@ -400,6 +436,39 @@ def mean_tsys(calon, caloff, tcal, mode=0, fedge=0.1, nedge=None):
     return np.abs(meanTsys)
 
 
+def nod_calibrate(sig1, ref1, sig2, ref2):
+    r"""Combine the two beams of a nodding observation into a single calibrated spectrum.
+
+    :math:`t = \frac{1}{2}\left(\frac{sig_1 - ref_1}{ref_1} + \frac{sig_2 - ref_2}{ref_2}\right)`
+
+    The arithmetic is done in place in two work arrays, instead of creating a temporary
+    array for every operation as chaining `~dysh.spectra.spectrum.Spectrum` arithmetic would.
+
+    Parameters
+    ----------
+    sig1 : `~numpy.ndarray`
+        The data of the first beam while it is on source.
+    ref1 : `~numpy.ndarray`
+        The data of the first beam while it is off source.
+    sig2 : `~numpy.ndarray`
+        The data of the second beam while it is on source.
+    ref2 : `~numpy.ndarray`
+        The data of the second beam while it is off source.
+
+    Returns
+    -------
+    t : `~numpy.ndarray`
+        The average of the two (sig-ref)/ref spectra.
+    """
+    t = np.subtract(sig1, ref1, dtype=np.float64)
+    t /= ref1
+    t2 = np.subtract(sig2, ref2, dtype=np.float64)
+    t2 /= ref2
+    t += t2
+    t *= 0.5
+    return t
+
+
 def sq_weighted_avg(a, axis=0, weights=None):
     # @todo make a generic moment or use scipy.stats.moment
     r"""Compute the mean square weighted average of an array (2nd moment).
@@ -672,9 +741,88 @@ def smooth(data, method="hanning", width=1, kernel=None, show=False):
     method = minimum_string_match(method, list(available_methods.keys()))
     if method == None:
         raise ValueError(f"Unrecognized input method {method}. Must be one of {list(available_methods.keys())}")
-    kernel = available_methods[method](width)
+    if method == "boxcar" and not show and width >= _BOXCAR_CUMSUM_WIDTH and float(width).is_integer():
+        return _boxcar_smooth(data, int(width))
     if show:
-        return kernel
+        return available_methods[method](width)
+    kernel = _smoothing_kernel(available_methods[method], width)
     # the boundary='extend' matches  GBTIDL's  /edge_truncate CONVOL() method
     new_data = convolve(data, kernel, boundary="extend")
     return new_data
+
+
+@lru_cache(maxsize=32)
+def _smoothing_kernel(kernel_class, width):
+    """
+    Create a smoothing kernel, reusing it for repeated calls with the same width.
+    Building an astropy kernel costs about as much as convolving a
+    spectrum of a few 10^4 channels with it.
+
+    Parameters
+    ----------
+    kernel_class : class
+        The `~astropy.convolution.Kernel1D` subclass.
+    width : float
+        The width argument of the kernel.
+
+    Returns
+    -------
+    kernel : `~astropy.convolution.Kernel1D`
+        The kernel. It is shared between calls, so it must not be modified.
+    """
+    return kernel_class(width)
+
+
+# Boxcar widths above which a running sum is faster than a direct convolution.
+_BOXCAR_CUMSUM_WIDTH = 64
+
+
+def _boxcar_smooth(data, width):
+    """
+    Boxcar smooth using differences of cumulative sums, which costs O(nchan)
+    independent of `width`, whereas a direct convolution costs O(nchan*width).
+    The result is the same as ``convolve(data, Box1DKernel(width), boundary="extend")``,
+    including the interpolation over NaN values. For an even `width` the kernel has
+    `width` +1 channels with half weight at both ends, as for `~astropy.convolution.Box1DKernel`.
+
+    Parameters
+    ----------
+    data : `~numpy.ndarray`
+        Input data array to smooth.
+    width : int
+        Width of the boxcar in channels.
+
+    Returns
+    -------
+    s : `~numpy.ndarray`
+        The smoothed data. It has the floating point type of `data`, as with
+        `~astropy.convolution.convolve`, although the sums are done in double precision.
+    """
+    nchan = len(data)
+    h = width // 2
+    x = np.pad(np.asarray(data, dtype=np.float64), h, mode="edge")
+    good = ~np.isnan(x)
+    x[~good] = 0.0
+    # Remove the mean so the running sum does not lose precision on large values.
+    if good.any():
+        x0 = x[good].mean()
+        x[good] -= x0
+    else:
+        x0 = 0.0
+    c = np.zeros(len(x) + 1)
+    np.cumsum(x, out=c[1:])
+    n = np.zeros(len(x) + 1)
+    np.cumsum(good, out=n[1:])
+    s = c[width : width + nchan] - c[:nchan]
+    k = n[width : width + nchan] - n[:nchan]
+    if width % 2 == 0:
+        # The kernel is the average of two boxes of `width` channels offset by one channel.
+        s += c[width + 1 : width + 1 + nchan] - c[1 : 1 + nchan]
+        k += n[width + 1 : width + 1 + nchan] - n[1 : 1 + nchan]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s /= k
+    s += x0
+    dtype = np.asarray(data).dtype
+    if dtype.kind == "f":
+        s = s.astype(dtype, copy=False)
+    return s
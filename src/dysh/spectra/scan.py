@@ -5,13 +5,14 @@ The classes that define various types of Scan and their calibration methods.
 import warnings
 from collections import UserList
 from copy import deepcopy
+from functools import cached_property
 
 import astropy.units as u
 import numpy as np
+import pandas as pd
 from astropy import constants as ac
 from astropy.io.fits import BinTableHDU, Column
 from astropy.table import Table, vstack
-from scipy import ndimage
 
 from dysh.spectra import core
 
@@ -33,12 +34,32 @@ from .spectrum import Spectrum
 # from astropy.coordinates.spectral_coordinate import NoVelocityWarning
 
 
+def _common_rows(rows1, rows2):
+    """
+    Get the sorted row indices that appear in both `rows1` and `rows2`.
+
+    Parameters
+    ----------
+    rows1 : list or `~numpy.ndarray` of int
+        The first list of row indices
+    rows2 : list or `~numpy.ndarray` of int
+        The second list of row indices
+
+    Returns
+    -------
+    rows : `~numpy.ndarray`
+        The sorted, unique, row indices common to both inputs
+    """
+    return np.intersect1d(np.asarray(rows1, dtype=int), np.asarray(rows2, dtype=int))
+
+
 # @todo change this to an ABC class. https://docs.python.org/3/library/abc.html
 # and create a SpectrumAverageMixin for timeaverage, polaverage, finalspectrum
 class ScanMixin:
     """This class describes the common interface to all Scan classes.
     A Scan represents one IF, one feed, and one or more polarizations.
-    Derived classes *must* implement :meth:`calibrate`.
+    Derived classes *must* implement :meth:`calibrate`, which should store the calibrated
+    data as a 2D `~numpy.ndarray` of shape (nspect, nchan) so it can be averaged directly.
     """
 
     @property
@@ -139,6 +160,38 @@ class ScanMixin:
         """
         return self._meta
 
+    @property
+    def _bintable_df(self):
+        """
+        The index of the bintable containing this Scan. It is looked up once and then reused.
+
+        Returns
+        -------
+        index : ~pandas.DataFrame
+            The index rows of the bintable of this Scan
+        """
+        if getattr(self, "_bintable_df_cache", None) is None:
+            self._bintable_df_cache = self._sdfits.index(bintable=self._bintable_index)
+        return self._bintable_df_cache
+
+    def _index_column(self, column, rows):
+        """
+        Get the values of an index column for some rows of the bintable of this Scan.
+
+        Parameters
+        ----------
+        column : str
+            The name of the index column, e.g., "EXPOSURE"
+        rows : list of int
+            The rows of the bintable index
+
+        Returns
+        -------
+        values : `~numpy.ndarray`
+            The values of `column` at `rows`
+        """
+        return self._bintable_df[column].to_numpy()[rows]
+
     def _meta_as_table(self):
         """get the metadata as an astropy Table"""
         return Table(self._meta)
@@ -162,7 +215,7 @@ class ScanMixin:
         """
         # FITS can't handle NaN in a header, so just drop any column where NaN appears
         # Ideally this should be done on the individual record level in say, Spectrum.make_spectrum.
-        df = self._sdfits.index(bintable=self._bintable_index).iloc[rowindices].dropna(axis=1, how="any")
+        df = self._bintable_df.iloc[rowindices].dropna(axis=1, how="any")
         self._meta = df.to_dict("records")  # returns dict(s) with key = row number.
         for i in range(len(self._meta)):
             if "CUNIT1" not in self._meta[i]:
@@ -592,17 +645,19 @@ class TPScan(ScanMixin):
         self._timeaveraged = None
         self._polaveraged = None
         self._nrows = len(scanrows)
+        self._row_records = None
         self._tsys = None
         if False:
             self._npol = gbtfits.npol(self._bintable_index)  # @todo deal with bintable
             self._nint = gbtfits.nintegrations(self._bintable_index)
         self._calrows = calrows
         # all cal=T states where sig=sigstate
-        self._refonrows = sorted(list(set(self._calrows["ON"]).intersection(set(self._scanrows))))
+        self._refonrows = _common_rows(self._calrows["ON"], self._scanrows)
         # all cal=F states where sig=sigstate
-        self._refoffrows = sorted(list(set(self._calrows["OFF"]).intersection(set(self._scanrows))))
-        self._refcalon = gbtfits.rawspectra(self._bintable_index)[self._refonrows]
-        self._refcaloff = gbtfits.rawspectra(self._bintable_index)[self._refoffrows]
+        self._refoffrows = _common_rows(self._calrows["OFF"], self._scanrows)
+        rawspectra = gbtfits.rawspectra(self._bintable_index)
+        self._refcalon = rawspectra[self._refonrows]
+        self._refcaloff = rawspectra[self._refoffrows]
         # now remove blanked integrations
         # seems like this should be done for all Scan classes!
         # PS: yes.
@@ -615,8 +670,8 @@ class TPScan(ScanMixin):
             print(f"Ignoring {nblanks} blanked integration(s).")
         self._refcalon = self._refcalon[goodrows]
         self._refcaloff = self._refcaloff[goodrows]
-        self._refonrows = [self._refonrows[i] for i in goodrows]
-        self._refoffrows = [self._refoffrows[i] for i in goodrows]
+        self._refonrows = self._refonrows[goodrows]
+        self._refoffrows = self._refoffrows[goodrows]
         self._nchan = len(self._refcalon[0])
         self._calibrate = calibrate
         self._data = None
@@ -630,13 +685,16 @@ class TPScan(ScanMixin):
         # since we have downselected based on sig state in the constructor
         if self.calstate is None:
             # print("data = 0.5*(ON+OFF)")
-            self._data = (0.5 * (self._refcalon + self._refcaloff)).astype(float)
+            # The data are kept in the precision of the raw data, typically float32.
+            data = self._refcalon + self._refcaloff
+            data *= 0.5
+            self._data = data
         elif self.calstate:
             # print("data = ON")
-            self._data = self._refcalon.astype(float)
+            self._data = self._refcalon.copy()
         elif self.calstate == False:
             # print("data = OFF")
-            self._data = self._refcaloff.astype(float)
+            self._data = self._refcaloff.copy()
         else:
             raise Exception(f"Unrecognized cal state {self.calstate}")  # should never happen
 
@@ -682,31 +740,25 @@ class TPScan(ScanMixin):
 
         if False:
             if self.calstate is None:
-                tcal = list(self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["TCAL"])
+                tcal = list(self._bintable_df.iloc[self._refonrows]["TCAL"])
                 nspect = len(tcal)
                 calon = self._refcalcon
                 caloff = self._refcaloff
             elif self.calstate:
-                tcal = list(self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["TCAL"])
+                tcal = list(self._bintable_df.iloc[self._refonrows]["TCAL"])
                 nspect = len(tcal)
                 calon = self._refcalon
             elif self.calstate == False:
                 pass
-        self._tcal = list(self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["TCAL"])
-        nspect = len(self._tcal)
-        self._tsys = np.empty(nspect, dtype=float)  # should be same as len(calon)
+        # One TCAL per integration, by construction of _refonrows.
+        self._tcal = self._index_column("TCAL", self._refonrows)
         # allcal = self._refonrows.copy()
         # allcal.extend(self._refoffrows)
         # tcal = list(self._sdfits.index(self._bintable_index).iloc[sorted(allcal)]["TCAL"])
-        # @todo this loop could be replaced with clever numpy
-        if len(self._tcal) != nspect:
-            raise Exception(f"TCAL length {len(tcal)} and number of spectra {nspect} don't match")
-        for i in range(nspect):
-            # tsys = mean_tsys(calon=calon[i], caloff=caloff[i], tcal=tcal[i])
-            tsys = mean_tsys(calon=self._refcalon[i], caloff=self._refcaloff[i], tcal=self._tcal[i])
-            self._tsys[i] = tsys
+        # Compute the system temperature of all integrations at once.
+        self._tsys = mean_tsys(calon=self._refcalon, caloff=self._refcaloff, tcal=self._tcal)
 
-    @property
+    @cached_property
     def exposure(self):
         """Get the array of exposure (integration) times.  The value depends on the cal state:
 
@@ -724,23 +776,19 @@ class TPScan(ScanMixin):
             The exposure time in units of the EXPOSURE keyword in the SDFITS header
         """
         if self.calstate is None:
-            exp_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["EXPOSURE"].to_numpy()
-            exp_ref_off = (
-                self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["EXPOSURE"].to_numpy()
-            )
+            exp_ref_on = self._index_column("EXPOSURE", self._refonrows)
+            exp_ref_off = self._index_column("EXPOSURE", self._refoffrows)
         elif self.calstate:
-            exp_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["EXPOSURE"].to_numpy()
+            exp_ref_on = self._index_column("EXPOSURE", self._refonrows)
             exp_ref_off = 0
         elif self.calstate == False:
             exp_ref_on = 0
-            exp_ref_off = (
-                self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["EXPOSURE"].to_numpy()
-            )
+            exp_ref_off = self._index_column("EXPOSURE", self._refoffrows)
 
         exposure = exp_ref_on + exp_ref_off
         return exposure
 
-    @property
+    @cached_property
     def delta_freq(self):
         r"""Get the array of channel frequency width. The value depends on the cal state:
 
@@ -759,8 +807,8 @@ class TPScan(ScanMixin):
         delta_freq: `~numpy.ndarray`
             The channel frequency width in units of the CDELT1 keyword in the SDFITS header
         """
-        df_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["CDELT1"].to_numpy()
-        df_ref_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["CDELT1"].to_numpy()
+        df_ref_on = self._index_column("CDELT1", self._refonrows)
+        df_ref_off = self._index_column("CDELT1", self._refoffrows)
         if self.calstate is None:
             delta_freq = 0.5 * (df_ref_on + df_ref_off)
         elif self.calstate:
@@ -776,10 +824,27 @@ class TPScan(ScanMixin):
         """
         return tsys_weight(self.exposure, self.delta_freq, self.tsys)
 
+    def _row_meta(self, i):
+        """
+        Get the index values of a row of this scan as a dictionary, without the NaN values.
+        The rows of the scan are converted to dictionaries once, on first use.
+
+        Parameters
+        ----------
+        i : int
+            The index into the rows of this scan
+
+        Returns
+        -------
+        meta : dict
+            A new dictionary with the non-NaN index values of the row
+        """
+        if self._row_records is None:
+            self._row_records = self._bintable_df.iloc[self._scanrows].to_dict("records")
+        return {k: v for k, v in self._row_records[i].items() if not pd.isna(v)}
+
     def tpmeta(self, i):
-        ser = self._sdfits.index(bintable=self._bintable_index).iloc[self._scanrows[i]]
-        # meta = self._sdfits.index(bintable=self._bintable_index).iloc[self._scanrows[i]].dropna().to_dict()
-        meta = ser.dropna().to_dict()
+        meta = self._row_meta(i)
         meta["TSYS"] = self._tsys[i]
         meta["EXPOSURE"] = self.exposure[i]
         meta["NAXIS1"] = len(self._data[i])
@@ -808,9 +873,7 @@ class TPScan(ScanMixin):
         if not self._calibrate:
             raise Exception("You must calibrate first to get a total power spectrum")
         # print(len(self._scanrows), i)
-        ser = self._sdfits.index(bintable=self._bintable_index).iloc[self._scanrows[i]]
-        # meta = self._sdfits.index(bintable=self._bintable_index).iloc[self._scanrows[i]].dropna().to_dict()
-        meta = ser.dropna().to_dict()
+        meta = self._row_meta(i)
         meta["TSYS"] = self._tsys[i]
         meta["EXPOSURE"] = self.exposure[i]
         meta["NAXIS1"] = len(self._data[i])
@@ -842,7 +905,8 @@ class TPScan(ScanMixin):
         """
         if self._npol > 1:
             raise Exception("Can't yet time average multiple polarizations")
-        self._timeaveraged = deepcopy(self.total_power(0))
+        # total_power() creates a new Spectrum and metadata, so there is no need to copy it.
+        self._timeaveraged = self.total_power(0)
         if weights == "tsys":
             w = self._tsys_weight
         else:
@@ -930,15 +994,16 @@ class PSScan(ScanMixin):
         if False:
             self._nint = gbtfits.nintegrations(self._bintable_index)
         # so quick with slicing!
-        self._sigonrows = sorted(list(set(self._calrows["ON"]).intersection(set(self._scanrows["ON"]))))
-        self._sigoffrows = sorted(list(set(self._calrows["OFF"]).intersection(set(self._scanrows["ON"]))))
-        self._refonrows = sorted(list(set(self._calrows["ON"]).intersection(set(self._scanrows["OFF"]))))
-        self._refoffrows = sorted(list(set(self._calrows["OFF"]).intersection(set(self._scanrows["OFF"]))))
-        self._sigcalon = gbtfits.rawspectra(self._bintable_index)[self._sigonrows]
+        self._sigonrows = _common_rows(self._calrows["ON"], self._scanrows["ON"])
+        self._sigoffrows = _common_rows(self._calrows["OFF"], self._scanrows["ON"])
+        self._refonrows = _common_rows(self._calrows["ON"], self._scanrows["OFF"])
+        self._refoffrows = _common_rows(self._calrows["OFF"], self._scanrows["OFF"])
+        rawspectra = gbtfits.rawspectra(self._bintable_index)
+        self._sigcalon = rawspectra[self._sigonrows]
         self._nchan = len(self._sigcalon[0])
-        self._sigcaloff = gbtfits.rawspectra(self._bintable_index)[self._sigoffrows]
-        self._refcalon = gbtfits.rawspectra(self._bintable_index)[self._refonrows]
-        self._refcaloff = gbtfits.rawspectra(self._bintable_index)[self._refoffrows]
+        self._sigcaloff = rawspectra[self._sigoffrows]
+        self._refcalon = rawspectra[self._refonrows]
+        self._refcaloff = rawspectra[self._refoffrows]
         self._tsys = None
         self._exposure = None
         self._calibrated = None
@@ -998,28 +1063,34 @@ class PSScan(ScanMixin):
 
         self._status = 1
         nspect = self.nrows // 2
-        self._calibrated = np.empty((nspect, self._nchan), dtype="d")
         self._tsys = np.empty(nspect, dtype="d")
         self._exposure = np.empty(nspect, dtype="d")
         # print("REFONROWS ", self._refonrows)
-        tcal = list(self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["TCAL"])
-        # @todo  this loop could be replaced with clever numpy
+        tcal = self._index_column("TCAL", self._refonrows)
         if len(tcal) != nspect:
             raise Exception(f"TCAL length {len(tcal)} and number of spectra {nspect} don't match")
-        for i in range(nspect):
-            tsys = mean_tsys(calon=self._refcalon[i], caloff=self._refcaloff[i], tcal=tcal[i])
-            sig = 0.5 * (self._sigcalon[i] + self._sigcaloff[i])
-            ref = 0.5 * (self._refcalon[i] + self._refcaloff[i])
-            if self._smoothref > 1:
-                ref = core.smooth(ref, "boxcar", self._smoothref)
-            self._calibrated[i] = tsys * (sig - ref) / ref
-            self._tsys[i] = tsys
-            self._exposure[i] = self.exposure[i]
+        self._tsys[:] = mean_tsys(calon=self._refcalon, caloff=self._refcaloff, tcal=tcal)
+        self._exposure[:] = self.exposure
+        # Calibrate all the integrations at once, tsys*(sig-ref)/ref, instead of one at a time.
+        # The arithmetic is done in the precision of the raw data (and in the same order)
+        # as when calibrating integration by integration, so the results do not change.
+        # The operations are done in place, so only the sig and ref buffers are allocated.
+        # The calibrated data keep that precision, typically float32, which halves their size.
+        sig = self._sigcalon + self._sigcaloff
+        sig *= 0.5
+        ref = self._refcalon + self._refcaloff
+        ref *= 0.5
+        if self._smoothref > 1:
+            ref = np.array([core.smooth(r, "boxcar", self._smoothref) for r in ref])
+        sig -= ref
+        sig *= self._tsys.astype(sig.dtype)[:, np.newaxis]
+        sig /= ref
+        self._calibrated = sig
         # print("Calibrated %d spectra" % nspect)
         self._add_calibration_meta()
 
     # tip o' the hat to Pedro S. for exposure and delta_freq
-    @property
+    @cached_property
     def exposure(self):
         """Get the array of exposure (integration) times
 
@@ -1030,10 +1101,10 @@ class PSScan(ScanMixin):
         exposure : ~numpy.ndarray
             The exposure time in units of the EXPOSURE keyword in the SDFITS header
         """
-        exp_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["EXPOSURE"].to_numpy()
-        exp_ref_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["EXPOSURE"].to_numpy()
-        exp_sig_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]["EXPOSURE"].to_numpy()
-        exp_sig_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigoffrows]["EXPOSURE"].to_numpy()
+        exp_ref_on = self._index_column("EXPOSURE", self._refonrows)
+        exp_ref_off = self._index_column("EXPOSURE", self._refoffrows)
+        exp_sig_on = self._index_column("EXPOSURE", self._sigonrows)
+        exp_sig_off = self._index_column("EXPOSURE", self._sigoffrows)
         exp_ref = exp_ref_on + exp_ref_off
         exp_sig = exp_sig_on + exp_sig_off
         if self._smoothref > 1:
@@ -1043,7 +1114,7 @@ class PSScan(ScanMixin):
         exposure = exp_sig * exp_ref * nsmooth / (exp_sig + exp_ref * nsmooth)
         return exposure
 
-    @property
+    @cached_property
     def delta_freq(self):
         """Get the array of channel frequency width
 
@@ -1054,10 +1125,10 @@ class PSScan(ScanMixin):
              delta_freq: ~numpy.ndarray
                  The channel frequency width in units of the CDELT1 keyword in the SDFITS header
         """
-        df_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["CDELT1"].to_numpy()
-        df_ref_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["CDELT1"].to_numpy()
-        df_sig_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]["CDELT1"].to_numpy()
-        df_sig_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigoffrows]["CDELT1"].to_numpy()
+        df_ref_on = self._index_column("CDELT1", self._refonrows)
+        df_ref_off = self._index_column("CDELT1", self._refoffrows)
+        df_sig_on = self._index_column("CDELT1", self._sigonrows)
+        df_sig_off = self._index_column("CDELT1", self._sigoffrows)
         df_ref = 0.5 * (df_ref_on + df_ref_off)
         df_sig = 0.5 * (df_sig_on + df_sig_off)
         delta_freq = 0.5 * (df_ref + df_sig)
@@ -1090,7 +1161,10 @@ class PSScan(ScanMixin):
             raise Exception("You can't time average before calibration.")
         if self._npol > 1:
             raise Exception("Can't yet time average multiple polarizations")
-        self._timeaveraged = deepcopy(self.calibrated(0))
+        self._timeaveraged = self.calibrated(0)
+        # The new Spectrum shares its metadata with this Scan. Copy only the metadata,
+        # so that updating it does not change the Scan.
+        self._timeaveraged.meta = deepcopy(self._timeaveraged.meta)
         data = self._calibrated
         if weights == "tsys":
             w = self._tsys_weight
@@ -1167,10 +1241,10 @@ class FSScan(ScanMixin):
         if self._smoothref > 1:
             print(f"FS smoothref={self._smoothref} not implemented yet")
 
-        self._sigonrows = sorted(list(set(self._calrows["ON"]).intersection(set(self._sigrows["ON"]))))
-        self._sigoffrows = sorted(list(set(self._calrows["OFF"]).intersection(set(self._sigrows["ON"]))))
-        self._refonrows = sorted(list(set(self._calrows["ON"]).intersection(set(self._sigrows["OFF"]))))
-        self._refoffrows = sorted(list(set(self._calrows["OFF"]).intersection(set(self._sigrows["OFF"]))))
+        self._sigonrows = _common_rows(self._calrows["ON"], self._sigrows["ON"])
+        self._sigoffrows = _common_rows(self._calrows["OFF"], self._sigrows["ON"])
+        self._refonrows = _common_rows(self._calrows["ON"], self._sigrows["OFF"])
+        self._refoffrows = _common_rows(self._calrows["OFF"], self._sigrows["OFF"])
 
         self._debug = debug
 
@@ -1216,10 +1290,11 @@ class FSScan(ScanMixin):
         # @todo use gbtfits.velocity_convention(veldef,velframe)
         # so quick with slicing!
 
-        self._sigcalon = gbtfits.rawspectra(self._bintable_index)[self._sigonrows]
-        self._sigcaloff = gbtfits.rawspectra(self._bintable_index)[self._sigoffrows]
-        self._refcalon = gbtfits.rawspectra(self._bintable_index)[self._refonrows]
-        self._refcaloff = gbtfits.rawspectra(self._bintable_index)[self._refoffrows]
+        rawspectra = gbtfits.rawspectra(self._bintable_index)
+        self._sigcalon = rawspectra[self._sigonrows]
+        self._sigcaloff = rawspectra[self._sigoffrows]
+        self._refcalon = rawspectra[self._refonrows]
+        self._refcaloff = rawspectra[self._refoffrows]
         self._nchan = len(self._sigcalon[0])
         self._tsys = None
         self._exposure = None
@@ -1342,7 +1417,7 @@ class FSScan(ScanMixin):
 
         def vec_mean_tsys(on, off, tcal):
             """
-            mean_tsys implements this, albeit only in 1D
+            mean_tsys implements this
             """
             pass
 
@@ -1384,6 +1459,8 @@ class FSScan(ScanMixin):
                 # This needs to be sorted out.
                 data2 = fft_shift(data2, fshift, pad=False)
             elif method == "interpolate":
+                from scipy import ndimage
+
                 data2 = ndimage.shift(data2, [fshift])
             return data2
 
@@ -1397,8 +1474,10 @@ class FSScan(ScanMixin):
         self._exposure = np.empty(nspect, dtype="d")
         #
         sig_freq = self._sigcalon[0]
-        df_sig = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]
-        df_ref = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]
+        # Only take the columns needed by index_frequency, not whole rows.
+        freq_cols = [c for c in ["TDIM7", "CRVAL1", "CRPIX1", "CDELT1", "VFRAME", "CUNIT1"] if c in self._bintable_df]
+        df_sig = self._bintable_df[freq_cols].iloc[self._sigonrows]
+        df_ref = self._bintable_df[freq_cols].iloc[self._refonrows]
         if self._debug:
             print("df_sig", type(df_sig), len(df_sig))
         sig_freq = index_frequency(df_sig)
@@ -1408,15 +1487,18 @@ class FSScan(ScanMixin):
             print("FS: shift=%g  nchan=%d" % (chan_shift, self._nchan))
 
         #  tcal is the same for REF and SIG, and the same for all integrations actually.
-        tcal = list(self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]["TCAL"])
+        tcal = self._index_column("TCAL", self._sigonrows)
         if self._debug:
             print("TCAL:", len(tcal), tcal[0])
         if len(tcal) != nspect:
             raise Exception(f"TCAL length {len(tcal)} and number of spectra {nspect} don't match")
+        # The system temperatures of all integrations are computed up front.
+        all_tsys_sig = mean_tsys(calon=self._sigcalon, caloff=self._sigcaloff, tcal=tcal)
+        all_tsys_ref = mean_tsys(calon=self._refcalon, caloff=self._refcaloff, tcal=tcal)
         # @todo   the nspect loop could be replaced with clever numpy?
         for i in range(nspect):
-            tsys_sig = mean_tsys(calon=self._sigcalon[i], caloff=self._sigcaloff[i], tcal=tcal[i])
-            tsys_ref = mean_tsys(calon=self._refcalon[i], caloff=self._refcaloff[i], tcal=tcal[i])
+            tsys_sig = all_tsys_sig[i]
+            tsys_ref = all_tsys_ref[i]
             if i == 0 and self._debug:
                 print("Tsys(sig/ref)[0]=", tsys_sig, tsys_ref)
             tp_sig = 0.5 * (self._sigcalon[i] + self._sigcaloff[i])
@@ -1449,7 +1531,7 @@ class FSScan(ScanMixin):
         # print("Calibrated %d spectra with fold=%s and use_sig=%s" % (nspect, repr(_fold), repr(self._use_sig)))
 
     # tip o' the hat to Pedro S. for exposure and delta_freq
-    @property
+    @cached_property
     def exposure(self):
         """Get the array of exposure (integration) times for FSscan
 
@@ -1460,10 +1542,10 @@ class FSScan(ScanMixin):
         exposure : ~numpy.ndarray
             The exposure time in units of the EXPOSURE keyword in the SDFITS header
         """
-        exp_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["EXPOSURE"].to_numpy()
-        exp_ref_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["EXPOSURE"].to_numpy()
-        exp_sig_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]["EXPOSURE"].to_numpy()
-        exp_sig_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigoffrows]["EXPOSURE"].to_numpy()
+        exp_ref_on = self._index_column("EXPOSURE", self._refonrows)
+        exp_ref_off = self._index_column("EXPOSURE", self._refoffrows)
+        exp_sig_on = self._index_column("EXPOSURE", self._sigonrows)
+        exp_sig_off = self._index_column("EXPOSURE", self._sigoffrows)
         exp_ref = exp_ref_on + exp_ref_off
         exp_sig = exp_sig_on + exp_sig_off
         if self._smoothref > 1:
@@ -1473,7 +1555,7 @@ class FSScan(ScanMixin):
         exposure = exp_sig * exp_ref * nsmooth / (exp_sig + exp_ref * nsmooth)
         return exposure
 
-    @property
+    @cached_property
     def delta_freq(self):
         """Get the array of channel frequency width
 
@@ -1484,10 +1566,10 @@ class FSScan(ScanMixin):
              delta_freq: ~numpy.ndarray
                  The channel frequency width in units of the CDELT1 keyword in the SDFITS header
         """
-        df_ref_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._refonrows]["CDELT1"].to_numpy()
-        df_ref_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._refoffrows]["CDELT1"].to_numpy()
-        df_sig_on = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigonrows]["CDELT1"].to_numpy()
-        df_sig_off = self._sdfits.index(bintable=self._bintable_index).iloc[self._sigoffrows]["CDELT1"].to_numpy()
+        df_ref_on = self._index_column("CDELT1", self._refonrows)
+        df_ref_off = self._index_column("CDELT1", self._refoffrows)
+        df_sig_on = self._index_column("CDELT1", self._sigonrows)
+        df_sig_off = self._index_column("CDELT1", self._sigoffrows)
         df_ref = 0.5 * (df_ref_on + df_ref_off)
         df_sig = 0.5 * (df_sig_on + df_sig_off)
         delta_freq = 0.5 * (df_ref + df_sig)
@@ -1520,7 +1602,10 @@ class FSScan(ScanMixin):
             raise Exception("You can't time average before calibration.")
         if self._npol > 1:
             raise Exception("Can't yet time average multiple polarizations %d" % self._npol)
-        self._timeaveraged = deepcopy(self.calibrated(0))
+        self._timeaveraged = self.calibrated(0)
+        # The new Spectrum shares its metadata with this Scan. Copy only the metadata,
+        # so that updating it does not change the Scan.
+        self._timeaveraged.meta = deepcopy(self._timeaveraged.meta)
         data = self._calibrated
         if weights == "tsys":
             w = self._tsys_weight
@@ -1657,7 +1742,8 @@ class SubBeamNodScan(ScanMixin):
             raise Exception("You can't time average before calibration.")
         if self._npol > 1:
             raise Exception(f"Can't yet time average multiple polarizations {self._npol}")
-        self._timeaveraged = deepcopy(self.calibrated(0))
+        # calibrated() creates a new Spectrum and metadata, so there is no need to copy it.
+        self._timeaveraged = self.calibrated(0)
         data = self._calibrated
         nchan = len(data[0])
         if weights == "tsys":
@@ -4,6 +4,7 @@ The Spectrum class to contain and manipulate spectra.
 
 import warnings
 from copy import deepcopy
+from functools import lru_cache
 
 import astropy.units as u
 import numpy as np
@@ -52,6 +53,82 @@ IGNORE_ON_COPY = [
     "_unit",
 ]
 
+# Metadata that change between the integrations of a scan, but are not used by the WCS.
+# They are left out of the key used to reuse a WCS in `Spectrum.make_spectrum`.
+_NON_WCS_META = {
+    "AZIMUTH",
+    "DURATION",
+    "ELEVATIO",
+    "EXPOSURE",
+    "INT",
+    "LST",
+    "MEANTSYS",
+    "OBSFREQ",
+    "QD_EL",
+    "QD_XEL",
+    "ROW",
+    "RVSYS",
+    "SUBREF_STATE",
+    "TSYS",
+    "VFRAME",
+    "WTTSYS",
+    "ZEROCHAN",
+}
+# WCS keywords that change between the integrations of a scan.
+# A reused WCS is updated with their values.
+_PER_INTEGRATION_WCS_META = ("CRVAL1", "CRVAL2", "CRVAL3", "DATE-OBS")
+
+
+@lru_cache(maxsize=64)
+def _wcs_template(header_items):
+    """
+    Create the WCS shared by all the integrations whose metadata match `header_items`.
+
+    Parameters
+    ----------
+    header_items : tuple
+        Sorted (keyword, value) pairs of the metadata, without the `_PER_INTEGRATION_WCS_META` keywords.
+
+    Returns
+    -------
+    wcs : `~astropy.wcs.WCS`
+        The WCS. It must not be modified, use a copy instead.
+    """
+    return WCS(header=dict(header_items))
+
+
+def _wcs_from_meta(meta):
+    """
+    Create a WCS from a metadata dictionary.
+    Integrations that only differ in their `_PER_INTEGRATION_WCS_META` or `_NON_WCS_META`
+    share a WCS that is created once, and copied and updated for each integration.
+
+    Parameters
+    ----------
+    meta : dict
+        The metadata, typically derived from an SDFITS header.
+
+    Returns
+    -------
+    wcs : `~astropy.wcs.WCS`
+        The WCS described by `meta`.
+    """
+    if "MJD-OBS" in meta:
+        # The MJD-OBS of the shared WCS could disagree with DATE-OBS.
+        return WCS(header=meta)
+    key = tuple(
+        sorted((k, v) for k, v in meta.items() if k not in _NON_WCS_META and k not in _PER_INTEGRATION_WCS_META)
+    )
+    try:
+        wcs = _wcs_template(key).deepcopy()
+    except TypeError:  # Unhashable values in meta.
+        return WCS(header=meta)
+    wcs.wcs.crval[:3] = meta["CRVAL1"], meta["CRVAL2"], meta["CRVAL3"]
+    wcs.wcs.dateobs = meta["DATE-OBS"]
+    wcs.wcs.mjdobs = np.nan
+    wcs.wcs.datfix()
+    return wcs
+
 
 class Spectrum(Spectrum1D):
     """
@@ -456,8 +533,7 @@ class Spectrum(Spectrum1D):
             new_meta["CDELT1"] = width * self.meta["CDELT1"]  # @todo etc ???
             s = Spectrum.make_spectrum(new_data, meta=new_meta)
             s._spectral_axis = self._spectral_axis[idx]
-            for i in range(len(s._spectral_axis)):  # grmpf, no proper setter
-                s._spectral_axis.value[i] += cell_shift
+            s._spectral_axis.value[:] += cell_shift  # grmpf, no proper setter
             if self._baseline_model is not None:
                 print("Warning: removing baseline_model")
                 s._baseline_model = None  # was already None
@@ -927,7 +1003,7 @@ class Spectrum(Spectrum1D):
         if not _required <= meta.keys():
             raise ValueError(f"Header (meta) is missing one or more required keywords: {_required}")
 
-        # @todo WCS is expensive.
+        # @todo WCS is expensive. The WCS is reused between integrations, see `_wcs_from_meta`.
         # Possibly figure how to calculate spectral_axis instead.
         # @todo allow fix=False in WCS constructor?
         if use_wcs:
@@ -937,11 +1013,9 @@ class Spectrum(Spectrum1D):
                 # Skip warnings FITS keywords longer than 8 chars or containing
                 # illegal characters (like _).
                 warnings.filterwarnings("ignore", category=VerifyWarning)
-                wcs = WCS(header=meta)
+                wcs = _wcs_from_meta(meta)
                 # It would probably be safer to add NAXISi to meta.
                 wcs.array_shape = (0, 0, 0, len(data))
-                # For some reason these aren't identified while creating the WCS object.
-                wcs.wcs.obsgeo[:3] = meta["SITELONG"], meta["SITELAT"], meta["SITEELEV"]
                 # Reset warnings.
         else:
             wcs = None
@@ -985,6 +1059,12 @@ class Spectrum(Spectrum1D):
             # observer_location=observer_location,
             target=target,
         )
+        if wcs is not None:
+            # For some reason these aren't identified while creating the WCS object.
+            # They are set after creating the Spectrum, otherwise deriving the spectral axis
+            # from the WCS also computes an observer for it, which is slow. The spectral axis
+            # observer and target are set by the Spectrum anyway.
+            wcs.wcs.obsgeo[:3] = meta["SITELONG"], meta["SITELAT"], meta["SITEELEV"]
         # For some reason, Spectrum1D.spectral_axis created with WCS do not inherit
         # the radial velocity. In fact, they get no radial_velocity attribute at all!
         # This method creates a new spectral_axis with the given radial velocity.
@@ -993,10 +1073,13 @@ class Spectrum(Spectrum1D):
         return s
 
     def _arithmetic_apply(self, other, op, handle_meta, **kwargs):
+        # compare_wcs=None creates the result without a WCS. The WCS and spectral axis
+        # are copied from this Spectrum by _copy_attributes, so deriving the spectral
+        # axis from the WCS (with its frame transformations) would be wasted work.
         if isinstance(other, NDCube):
-            result = op(other, **{"handle_meta": handle_meta})
+            result = op(other, **{"handle_meta": handle_meta, "compare_wcs": None})
         else:
-            result = op(other, **{"handle_meta": handle_meta, "meta_other_meta": False})
+            result = op(other, **{"handle_meta": handle_meta, "meta_other_meta": False, "compare_wcs": None})
         self._copy_attributes(result)
         return result
 
@@ -73,6 +73,9 @@ class TestPSScan:
         assert ta.meta["TSYS"] == pytest.approx(table["TSYS"], rel=5e-6)
         assert ta.meta["EXPOSURE"] == table["EXPOSURE"]
         assert np.all(np.abs(table["DATA"][0] - ta.flux.value) < 3e-7)
+        # Time averaging must not change the metadata of the scans.
+        for ps in ps_scans:
+            assert "WTTSYS" not in ps.meta[0]
 
     def test_ps_with_selection(self, data_dir):
         data_path = f"{data_dir}/TGBT21A_501_11/NGC2782"
@@ -146,13 +149,12 @@ class TestPSScan:
             # Set to 5E-16 because Windows OS tests fail below that.  Need to understand why.
             assert np.all(abs(ps_sb[0].calibrated(0).flux.value - ta1.flux.value) < 5e-16)
 
-    def test_scan_write(self, data_dir):
+    def test_scan_write(self, data_dir, tmp_path):
         data_path = f"{data_dir}/TGBT21A_501_11/NGC2782_blanks"
         sdf_file = f"{data_path}/NGC2782.raw.vegas.A.fits"
         sdf = gbtfitsload.GBTFITSLoad(sdf_file)
         ps_sb = sdf.getps(scan=[156], plnum=0, ifnum=0)
-        # @todo properly use tmpdir and remove
-        ps_sb[0].write("foobar.fits", overwrite=True)
+        ps_sb[0].write(tmp_path / "foobar.fits", overwrite=True)
 
 
 class TestSubBeamNod:
@@ -189,7 +191,13 @@ class TestSubBeamNod:
 
         # Generate fake data.
         def gauss(x, a, s, c):
-            return a * np.exp(-((x - c) ** 2.0) / (2 * s**2.0))
+            # In place, to avoid a temporary array per operation.
+            g = np.subtract(x, c, dtype=float)
+            g *= g
+            g /= -2.0 * s**2.0
+            np.exp(g, out=g)
+            g *= a
+            return g
 
         # Make a fake data set.
         gain = 1e8
@@ -210,7 +218,9 @@ class TestSubBeamNod:
 
         # Generate astro signal.
         np.random.seed(0)  # Fix the noise.
-        sig_mod = np.random.normal(loc=0, scale=0.1, size=(n_sig, nchan)) + gauss(x, a, s, c) + tcont
+        sig_mod = np.random.normal(loc=0, scale=0.1, size=(n_sig, nchan))
+        sig_mod += gauss(x, a, s, c)
+        sig_mod += tcont
         ref_mod = np.random.normal(loc=0, scale=0.1, size=(n_ref, nchan))
 
         # Add noise diode.
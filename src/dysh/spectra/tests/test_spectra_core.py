@@ -41,6 +41,12 @@ class TestMeanTsys:
         # Compare.
         assert tsys_dysh == pytest.approx(expected)
 
+        # All integrations at once should give the same values.
+        tcals = table_pl0_off["TCAL"][1::2]
+        tsys_2d = core.mean_tsys(calon=table_pl0_off["DATA"][1::2], caloff=table_pl0_off["DATA"][0::2], tcal=tcals)
+        assert tsys_2d.shape == tsys_dysh.shape
+        assert np.all(tsys_2d == tsys_dysh)
+
     def test_tsys2(self):
         path_to_file = f"{self.data_dir}/TGBT21A_501_11"
         filein = f"{path_to_file}/TGBT21A_501_11.raw.vegas.fits"
@@ -88,3 +94,65 @@ class TestMeanTsys:
 
         for k, v in pairs.items():
             assert k == pytest.approx(core.tsys_weight(v["exposure"], v["delta_freq"], v["tsys"]))
+
+    def test_nod_calibrate(self):
+        """Test that `dysh.spectra.core.nod_calibrate` matches the direct expression."""
+        rng = np.random.default_rng(12345)
+        sig1, ref1, sig2, ref2 = rng.uniform(1, 2, size=(4, 64)).astype(np.float32)
+        expected = 0.5 * ((sig1 - ref1) / ref1 + (sig2 - ref2) / ref2)
+        inputs = [sig1.copy(), ref1.copy(), sig2.copy(), ref2.copy()]
+        t = core.nod_calibrate(sig1, ref1, sig2, ref2)
+        assert t.dtype == np.float64
+        assert t == pytest.approx(expected)
+        # The inputs must be left untouched.
+        for a, b in zip([sig1, ref1, sig2, ref2], inputs):
+            assert np.array_equal(a, b)
+
+    @pytest.mark.parametrize("width", [64, 65, 256])
+    def test_smooth_wide_boxcar(self, width):
+        """Test that wide boxcars, which use a running sum, match the direct convolution."""
+        from astropy.convolution import Box1DKernel, convolve
+
+        rng = np.random.default_rng(2024)
+        data = rng.normal(5e8, 1e6, 4096)
+        data[rng.integers(0, 4096, 200)] = np.nan
+        data[0] = np.nan
+        expected = convolve(data, Box1DKernel(width), boundary="extend")
+        smoothed = core.smooth(data, "boxcar", width)
+        assert smoothed == pytest.approx(expected, rel=1e-12)
+        assert smoothed.dtype == np.float64
+        # The type of the data is kept, as for narrow boxcars.
+        assert core.smooth(data.astype(np.float32), "boxcar", width).dtype == np.float32
+
+    def test_smooth_kernel_cache(self):
+        """Test that repeated smoothing reuses the kernel and gives the same result."""
+        data = np.random.default_rng(11).normal(size=512)
+        a = core.smooth(data, "gaussian", 4.0)
+        hits = core._smoothing_kernel.cache_info().hits
+        b = core.smooth(data, "gaussian", 4.0)
+        assert core._smoothing_kernel.cache_info().hits == hits + 1
+        assert np.array_equal(a, b)
+        # The kernel returned with show=True is not the shared one.
+        assert core.smooth(data, "gaussian", 4.0, show=True) is not core.smooth(data, "gaussian", 4.0, show=True)
+
+    def test_integration_isnan(self):
+        """Test that `dysh.spectra.core.integration_isnan` only flags fully blanked integrations."""
+        data = np.ones((5, 16))
+        data[1] = np.nan
+        data[2, 0] = np.nan
+        data[3, 4:] = np.nan
+        assert np.all(core.integration_isnan(data) == [False, True, False, False, False])
+
+    def test_average(self):
+        """Test that `dysh.spectra.core.average` skips blanked integrations."""
+        rng = np.random.default_rng(7)
+        data = rng.normal(size=(5, 32))
+        w = rng.uniform(1, 2, 5)
+        assert core.average(data, weights=w) == pytest.approx(np.average(data, axis=0, weights=w))
+        idata = rng.integers(0, 100, size=(5, 32))
+        iw = rng.integers(1, 10, 5)
+        assert core.average(idata, weights=iw) == pytest.approx(np.average(idata, axis=0, weights=iw))
+        data[[1, 3]] = np.nan
+        good = [0, 2, 4]
+        assert core.average(data) == pytest.approx(data[good].mean(axis=0))
+        assert core.average(data, weights=w) == pytest.approx(np.average(data[good], axis=0, weights=w[good]))
@@ -1,7 +1,10 @@
+import operator
 from unittest.mock import patch
 
 import astropy.units as u
 import numpy as np
+import pytest
+from astropy.wcs import WCS
 
 from dysh.fits.gbtfitsload import GBTFITSLoad
 from dysh.spectra.spectrum import IGNORE_ON_COPY, Spectrum
@@ -26,118 +29,60 @@ def compare_spectrum(one, other):
 
 
 class TestSpectrum:
-    def setup_method(self):
+    @pytest.fixture(scope="class", autouse=True)
+    def spectra(self, request):
+        """Calibrate the spectra once and share them between tests, which only read them."""
         data_dir = get_project_testdata() / "AGBT05B_047_01"
         sdf_file = data_dir / "AGBT05B_047_01.raw.acs"
         sdf = GBTFITSLoad(sdf_file)
         getps0 = sdf.getps(51, plnum=0)
-        self.ps0 = getps0.timeaverage()
+        request.cls.ps0 = getps0.timeaverage()
         getps1 = sdf.getps(51, plnum=1)
-        self.ps1 = getps1.timeaverage()
-
-    def test_add(self):
-        """Test that we can add two `Spectrum`."""
-        addition = self.ps0 + self.ps1
-
-        assert addition.meta["EXPOSURE"] == (self.ps0.meta["EXPOSURE"] + self.ps1.meta["EXPOSURE"])
-        assert np.all(addition.flux.value == (self.ps0.flux.value + self.ps1.flux.value))
-        assert addition.flux.unit == self.ps0.flux.unit
-        assert addition.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, addition)
-
-    def test_add_scalar(self):
-        """Test that we can add a scalar to a `Spectrum`."""
-        addition = self.ps0 + 10.0
-
-        assert addition.meta["EXPOSURE"] == self.ps0.meta["EXPOSURE"]
-        assert np.all(addition.flux.value == (self.ps0.flux.value + 10.0))
-        assert addition.flux.unit == self.ps0.flux.unit
-        assert addition.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, addition)
-
-    def test_radd_scalar(self):
-        """Test that we can add a scalar to a `Spectrum`."""
-        addition = 10 + self.ps0
-
-        assert addition.meta["EXPOSURE"] == self.ps0.meta["EXPOSURE"]
-        assert np.all(addition.flux.value == (self.ps0.flux.value + 10.0))
-        assert addition.flux.unit == self.ps0.flux.unit
-        assert addition.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, addition)
-
-    def test_sub(self):
-        """Test that we can subtract two `Spectrum`."""
-        subtraction = self.ps0 - self.ps1
-
-        assert subtraction.meta["EXPOSURE"] == (self.ps0.meta["EXPOSURE"] + self.ps1.meta["EXPOSURE"])
-        assert np.all(subtraction.flux.value == (self.ps0.flux.value - self.ps1.flux.value))
-        assert subtraction.flux.unit == self.ps0.flux.unit
-        assert subtraction.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, subtraction)
-
-    def test_sub_scalar(self):
-        """Test that we can subtract a scalar from a `Spectrum`."""
-        subtraction = self.ps0 - 10.0
-
-        assert subtraction.meta["EXPOSURE"] == self.ps0.meta["EXPOSURE"]
-        assert np.all(subtraction.flux.value == (self.ps0.flux.value - 10.0))
-        assert subtraction.flux.unit == self.ps0.flux.unit
-        assert subtraction.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, subtraction)
-
-    def test_rsub_scalar(self):
-        """Test that we can subtract a scalar from a `Spectrum`."""
-        subtraction = 10.0 - self.ps0
-
-        assert subtraction.meta["EXPOSURE"] == self.ps0.meta["EXPOSURE"]
-        assert np.all(subtraction.flux.value == (10.0 - self.ps0.flux.value))
-        assert subtraction.flux.unit == self.ps0.flux.unit
-        assert subtraction.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, subtraction)
-
-    def test_mul(self):
-        """Test that we can multiply two `Spectrum`."""
-        multiplication = self.ps0 * self.ps1
-
-        assert np.all(multiplication.flux.value == (self.ps0.flux.value * self.ps1.flux.value))
-        assert multiplication.flux.unit == self.ps0.flux.unit * self.ps1.flux.unit
-        assert multiplication.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, multiplication)
-
-    def test_mul_scalar(self):
-        """Test that we can multiply a `Spectrum` and a scalar."""
-        multiplication = self.ps0 * 1.0
-
-        assert np.all(multiplication.flux.value == (self.ps0.flux.value))
-        assert multiplication.flux.unit == self.ps0.flux.unit
-        assert multiplication.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, multiplication)
-
-    def test_rmul_scalar(self):
-        """Test that we can multiply a `Spectrum` and a scalar."""
-        multiplication = 1.0 * self.ps0
-
-        assert np.all(multiplication.flux.value == (self.ps0.flux.value))
-        assert multiplication.flux.unit == self.ps0.flux.unit
-        assert multiplication.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, multiplication)
-
-    def test_div(self):
-        """Test that we can divide two `Spectrum`."""
-        division = self.ps0 / self.ps1
-
-        assert np.all(division.flux.value == (self.ps0.flux.value / self.ps1.flux.value))
-        assert division.flux.unit == self.ps0.flux.unit / self.ps1.flux.unit
-        compare_spectrum(self.ps0, division)
-
-    def test_div_scalar(self):
-        """Test that we can divide a `Spectrum` by a scalar."""
-        division = self.ps0 / 1.0
+        request.cls.ps1 = getps1.timeaverage()
+
+    @pytest.mark.parametrize(
+        "op, sum_exposure",
+        [(operator.add, True), (operator.sub, True), (operator.mul, False), (operator.truediv, False)],
+    )
+    def test_arithmetic(self, op, sum_exposure):
+        """Test that we can add, subtract, multiply and divide two `Spectrum`."""
+        result = op(self.ps0, self.ps1)
+
+        if sum_exposure:
+            assert result.meta["EXPOSURE"] == (self.ps0.meta["EXPOSURE"] + self.ps1.meta["EXPOSURE"])
+            assert result.flux.unit == self.ps0.flux.unit
+        else:
+            assert result.flux.unit == op(self.ps0.flux.unit, self.ps1.flux.unit)
+        assert np.array_equal(result.flux.value, op(self.ps0.flux.value, self.ps1.flux.value))
+        assert result.velocity_frame == self.ps0.velocity_frame
+        compare_spectrum(self.ps0, result)
+
+    @pytest.mark.parametrize(
+        "op, scalar, reflected",
+        [
+            (operator.add, 10.0, False),
+            (operator.add, 10, True),
+            (operator.sub, 10.0, False),
+            (operator.sub, 10.0, True),
+            (operator.mul, 1.0, False),
+            (operator.mul, 1.0, True),
+            (operator.truediv, 1.0, False),
+        ],
+    )
+    def test_arithmetic_scalar(self, op, scalar, reflected):
+        """Test that we can add, subtract, multiply and divide a `Spectrum` and a scalar, on either side."""
+        if reflected:
+            result = op(scalar, self.ps0)
+            expected = op(scalar, self.ps0.flux.value)
+        else:
+            result = op(self.ps0, scalar)
+            expected = op(self.ps0.flux.value, scalar)
 
-        assert np.all(division.flux.value == (self.ps0.flux.value))
-        assert division.flux.unit == self.ps0.flux.unit
-        assert division.velocity_frame == self.ps0.velocity_frame
-        compare_spectrum(self.ps0, division)
+        assert result.meta["EXPOSURE"] == self.ps0.meta["EXPOSURE"]
+        assert np.array_equal(result.flux.value, expected)
+        assert result.flux.unit == self.ps0.flux.unit
+        assert result.velocity_frame == self.ps0.velocity_frame
+        compare_spectrum(self.ps0, result)
 
     def test_write_read_fits(self, tmp_path):
         """Test that we can read fits files written by dysh"""
@@ -147,9 +92,9 @@ class TestSpectrum:
         file = o / "test_spectrum_write.fits"
         s.write(file, format="fits", overwrite=True)
         s2 = Spectrum.read(file, format="fits")
-        assert np.all(s.data == s2.data)
+        assert np.array_equal(s.data, s2.data)
         assert s.target == s2.target
-        assert np.all(s2.spectral_axis == s.spectral_axis)
+        assert np.array_equal(s2.spectral_axis, s.spectral_axis)
         # This test will generally fail because SITELONG, SITELAT, SITEELEV
         # don't have enough precision to match exactly our known GBT coordinates.
         # @todo make a close_enough comparison by differencing the observer
@@ -157,8 +102,10 @@ class TestSpectrum:
         # if s2.observer is not None:
         #    assert s.observer == s2.observer
 
-    def test_write_read_ascii(self, tmp_path):
-        fmt = [
+    @pytest.mark.slow
+    @pytest.mark.parametrize(
+        "fmt",
+        [
             "basic",
             "ascii.commented_header",
             "commented_header",
@@ -166,23 +113,28 @@ class TestSpectrum:
             "ascii.ipac",
             "ipac",
             "votable",
-            "ecsv",
             "mrt",
-        ]
+        ],
+    )
+    def test_write_ascii_lossy(self, fmt, tmp_path):
+        """Test that we can write ascii formats that do not roundtrip. Run with `pytest -m slow`."""
+        # These formats are only written, so a short slice of the spectrum is enough.
+        s_small = self.ps1[0:128]
+        file = tmp_path / f"testwrite.{fmt}"
+        s_small.write(file, format=fmt, overwrite=True)
+        assert file.stat().st_size > 0
+
+    def test_write_read_ascii(self, tmp_path):
         s = self.ps1
-        o = tmp_path / "sub"
-        o.mkdir()
-        for f in fmt:
-            file = o / f"testwrite.{f}"
-            s.write(file, format=f, overwrite=True)
-            # ECSV is the only ascii format that can
-            # complete a roundtrip unscathed.
-            # (See https://docs.astropy.org/en/latest/io/unified.html#table-io)
-            if f == "ecsv":
-                s2 = Spectrum.read(file, format=f)
-                assert np.all(s.data == s2.data)
-                assert np.all(s.spectral_axis == s2.spectral_axis)
-                assert s.target == s2.target
+        # ECSV is the only ascii format that can
+        # complete a roundtrip unscathed.
+        # (See https://docs.astropy.org/en/latest/io/unified.html#table-io)
+        file = tmp_path / "testwrite.ecsv"
+        s.write(file, format="ecsv", overwrite=True)
+        s2 = Spectrum.read(file, format="ecsv")
+        assert np.array_equal(s.data, s2.data)
+        assert np.array_equal(s.spectral_axis, s2.spectral_axis)
+        assert s.target == s2.target
         # Test reading in a GBTIDL ascii file
         gbtidl_file = get_project_testdata() / "gbtidl_spectra/onoff-L_gettp_156_intnum_0_LSR.ascii"
         s2 = Spectrum.read(gbtidl_file, format="gbtidl")
@@ -201,7 +153,6 @@ class TestSpectrum:
         assert s2.flux.unit == u.K
         assert s2.flux[0].value == -0.1042543
         assert s2.spectral_axis.unit == u.Unit("km/s")
-        # @todo remove the temporary files.  This should be done in a teardown() method
 
     @patch("dysh.plot.specplot.plt.show")
     def test_slice(self, mock_show, tmp_path):
@@ -216,9 +167,9 @@ class TestSpectrum:
         trimmed = self.ps0[s]
         assert trimmed.flux[0] == self.ps0.flux[s.start]
         assert trimmed.flux[-1] == self.ps0.flux[s.stop - 1]
-        assert np.all(trimmed.flux == self.ps0.flux[s])
+        assert np.array_equal(trimmed.flux, self.ps0.flux[s])
         # The slicing changes the values at the micro Hz level.
-        assert np.all(trimmed.spectral_axis.value - self.ps0.spectral_axis[s].value < 1e-5)
+        assert np.allclose(trimmed.spectral_axis.value, self.ps0.spectral_axis[s].value, atol=1e-5, rtol=0)
         # Check meta values. The trimmed spectrum has an additional
         # key: 'original_wcs'.
         for k, v in self.ps0.meta.items():
@@ -237,16 +188,16 @@ class TestSpectrum:
         trimmed.write(out, format="fits", overwrite=True)
         # Check that we can read it back.
         trimmed_read = Spectrum.read(out, format="fits")
-        assert np.all(trimmed.flux == trimmed_read.flux)
-        assert np.all(trimmed.spectral_axis == trimmed_read.spectral_axis)
+        assert np.array_equal(trimmed.flux, trimmed_read.flux)
+        assert np.array_equal(trimmed.spectral_axis, trimmed_read.spectral_axis)
         assert trimmed.target == trimmed_read.target
 
         # Now slice using units.
         # Hz.
         spec_ax = self.ps0.spectral_axis
         trimmed_nu = self.ps0[spec_ax[s.start].to("Hz") : spec_ax[s.stop].to("Hz")]
-        assert np.all(trimmed_nu.flux == self.ps0.flux[s])
-        assert np.all(trimmed_nu.spectral_axis.value - self.ps0.spectral_axis[s].value < 1e-5)
+        assert np.array_equal(trimmed_nu.flux, self.ps0.flux[s])
+        assert np.allclose(trimmed_nu.spectral_axis.value, self.ps0.spectral_axis[s].value, atol=1e-5, rtol=0)
         for k, v in self.ps0.meta.items():
             if k not in meta_ignore:
                 assert trimmed_nu.meta[k] == v
@@ -257,8 +208,8 @@ class TestSpectrum:
         # km/s.
         spec_ax = self.ps0.spectral_axis.to("km/s")
         trimmed_vel = self.ps0[spec_ax[s.start] : spec_ax[s.stop]]
-        assert np.all(trimmed_vel.flux == self.ps0.flux[s])
-        assert np.all(trimmed_vel.spectral_axis.value - self.ps0.spectral_axis[s].value < 1e-5)
+        assert np.array_equal(trimmed_vel.flux, self.ps0.flux[s])
+        assert np.allclose(trimmed_vel.spectral_axis.value, self.ps0.spectral_axis[s].value, atol=1e-5, rtol=0)
         for k, v in self.ps0.meta.items():
             if k not in meta_ignore:
                 assert trimmed_vel.meta[k] == v
@@ -269,5 +220,19 @@ class TestSpectrum:
         # m.
         spec_ax = self.ps0.spectral_axis.to("m")
         trimmed_wav = self.ps0[spec_ax[s.start] : spec_ax[s.stop]]
-        assert np.all(trimmed_wav.flux == self.ps0.flux[s])
-        assert np.all(trimmed_wav.spectral_axis.value - self.ps0.spectral_axis[s].value < 1e-5)
+        assert np.array_equal(trimmed_wav.flux, self.ps0.flux[s])
+        assert np.allclose(trimmed_wav.spectral_axis.value, self.ps0.spectral_axis[s].value, atol=1e-5, rtol=0)
+
+    def test_make_spectrum_wcs(self):
+        """Test that a reused WCS is the same as one created from scratch."""
+        meta = dict(self.ps0.meta)
+        data = self.ps0.flux.value
+        for crval2, dateobs in [(10.0, "2005-11-23T00:10:00.00"), (10.5, "2005-11-23T00:20:30.50")]:
+            meta["CRVAL2"] = crval2
+            meta["DATE-OBS"] = dateobs
+            s = Spectrum.make_spectrum(data * u.K, meta=meta)
+            expected = WCS(header=meta)
+            expected.wcs.obsgeo[:3] = meta["SITELONG"], meta["SITELAT"], meta["SITEELEV"]
+            assert s.wcs.wcs.mjdobs == expected.wcs.mjdobs
+            assert s.wcs.to_header() == expected.to_header()
+            assert np.array_equal(s.wcs.wcs.crval, expected.wcs.crval)
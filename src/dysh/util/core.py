@@ -4,6 +4,8 @@ Core utility definitions, classes, and functions
 
 import hashlib
 import sys
+from collections import deque
+from functools import cache, lru_cache
 from pathlib import Path
 
 # import astropy.units as u
@@ -32,7 +34,9 @@ def select_from(key, value, df):
         The subselected DataFrame
 
     """
-    return df[(df[key] == value)]
+    # Compare on the underlying numpy array; this avoids the pandas
+    # Series machinery, which dominates for the small frames used here.
+    return df[df[key].to_numpy() == value]
 
 
 def indices_where_value_changes(colname, df):
@@ -72,23 +76,28 @@ def gbt_timestamp_to_time(timestamp):
 
     Parameters
     ----------
-    timestamp : str
+    timestamp : str or array-like of str
         The GBT format timestamp as described above.
+        An array of timestamps is converted in a single call.
 
     Returns
     -------
     time : `~astropy.time.Time`
-        The time object
+        The time object, an array if `timestamp` is an array.
     """
     # convert to ISO FITS format  YYYY-MM-DDTHH:MM:SS(.SSS)
-    t = timestamp.replace("_", "-", 2).replace("_", "T")
-    return Time(t, scale="utc")
+    if isinstance(timestamp, str):
+        t = timestamp.replace("_", "-", 2).replace("_", "T")
+    else:
+        t = np.char.replace(np.asarray(timestamp, dtype=str), "_", "-", 2)
+        t = np.char.replace(t, "_", "T")
+    return Time(t, format="isot", scale="utc")
 
 
 def generate_tag(values, hashlen):
     """
     Generate a unique tag based on input values.  A hash object is
-    created from the input values using SHA256, and a hex representation is created.
+    created from the input values using BLAKE2b, and a hex representation is created.
     The first `hashlen` characters of the hex string are returned.
 
     Parameters
@@ -104,8 +113,17 @@ def generate_tag(values, hashlen):
         The hash string
 
     """
-    data = "".join(map(str, values))
-    hash_object = hashlib.sha256(data.encode())
+    # Only hashlen hex characters are kept, so only ask for that many bytes of digest.
+    hash_object = hashlib.blake2b(digest_size=min(max((hashlen + 1) // 2, 1), hashlib.blake2b.MAX_DIGEST_SIZE))
+    if isinstance(values, (bytes, bytearray)):
+        hash_object.update(values)
+    elif isinstance(values, np.ndarray) and values.dtype.kind != "O":
+        # Hash the array buffer directly, which is only copied if it is not contiguous.
+        # Object arrays hold pointers, so they are hashed by value below.
+        hash_object.update(np.ascontiguousarray(values))
+    else:
+        # Hashing the concatenated strings once gives the same digest as hashing each in turn.
+        hash_object.update("".join(map(str, values)).encode())
     unique_id = hash_object.hexdigest()
     return unique_id[0:hashlen]
 
@@ -128,7 +146,36 @@ def consecutive(data, stepsize=1):
     groups : `~numpy.ndarray`
         Array with values of `data` separated into groups.
     """
-    return np.split(data, np.where(np.diff(data) >= stepsize)[0] + 1)
+    data = np.asarray(data)
+    return [data[start:stop] for start, stop in iter_consecutive(data, stepsize)]
+
+
+def iter_consecutive(data, stepsize=1):
+    """Yields the index ranges of the groups of elements in `data`
+    separated by less than stepsize, as returned by `consecutive`.
+
+    Parameters
+    ----------
+    data : array
+        Array with values to split.
+    stepsize : int
+        Maximum separation between elements of `data`
+        to be considered a single group.
+
+    Yields
+    ------
+    start, stop : int
+        The group is `data[start:stop]`.
+    """
+    n = len(data)
+    if n < 2:
+        yield 0, n
+        return
+    start = 0
+    for stop in np.flatnonzero(np.diff(data) >= stepsize) + 1:
+        yield start, int(stop)
+        start = int(stop)
+    yield start, n
 
 
 def sq_weighted_avg(a, axis=0, weights=None):
@@ -153,21 +200,36 @@ def sq_weighted_avg(a, axis=0, weights=None):
     average : `~numpy.ndarray`
         The average along the input axis
     """
+    a = np.asarray(a)
+    if weights is not None:
+        weights = np.asarray(weights)
+    if axis is None or (weights is not None and weights.shape != (a.shape[axis],)):
+        # Weights with the shape of `a`, or averaging over the flattened array.
+        return np.sqrt(np.average(a * a, axis=axis, weights=weights))
+    # Move the averaging axis last, so that einsum forms the sum of squares
+    # in a single pass without a temporary a*a array.
+    a = np.moveaxis(a, axis, -1)
     if weights is None:
-        w = np.ones_like(a)
+        num = np.einsum("...i,...i->...", a, a)
+        den = a.shape[-1]
     else:
-        w = weights
-    v = np.sqrt(np.average(a * a, axis=axis, weights=w))
+        num = np.einsum("...i,...i,i->...", a, a, weights)
+        den = weights.sum()
+        if den == 0:
+            raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+    v = np.sqrt(num / den)
     return v
 
 
+@cache
 def get_project_root() -> Path:
     """
     Returns the project root directory.
     """
-    return Path(__file__).parent.parent.parent.parent
+    return Path(__file__).parents[3]
 
 
+@cache
 def get_project_testdata() -> Path:
     """
     Returns the project testdata directory
@@ -175,26 +237,55 @@ def get_project_testdata() -> Path:
     return get_project_root() / "testdata"
 
 
+# Types whose size is just `sys.getsizeof`, so there is nothing to walk.
+_SIZE_LEAF_TYPES = frozenset([str, bytes, bytearray, int, float, complex, bool, type(None)])
+
+
 def get_size(obj, seen=None):
-    """Recursively finds size of objects.
+    """Finds the size of objects, including everything they refer to.
     See https://goshippo.com/blog/measure-real-size-any-python-object/
+
+    The object graph is walked with an explicit stack rather than recursion,
+    so deeply nested objects do not hit the recursion limit.
+
+    Parameters
+    ----------
+    obj : object
+        The object to measure.
+    seen : set, optional
+        The `id` of objects already counted, which will not be counted again.
+
+    Returns
+    -------
+    size : int
+        The size of `obj` in bytes.
     """
-    size = sys.getsizeof(obj)
     if seen is None:
         seen = set()
-    obj_id = id(obj)
-    if obj_id in seen:
-        return 0
-    # Important mark as seen *before* entering recursion to gracefully handle
-    # self-referential objects
-    seen.add(obj_id)
-    if isinstance(obj, dict):
-        size += sum([get_size(v, seen) for v in obj.values()])
-        size += sum([get_size(k, seen) for k in obj.keys()])
-    elif hasattr(obj, "__dict__"):
-        size += get_size(obj.__dict__, seen)
-    elif hasattr(obj, "__iter__") and not isinstance(obj, (str, bytes, bytearray)):
-        size += sum([get_size(i, seen) for i in obj])
+    stack = deque([obj])
+    size = 0
+    while stack:
+        o = stack.pop()
+        obj_id = id(o)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        size += sys.getsizeof(o)
+        t = type(o)
+        if t in _SIZE_LEAF_TYPES:
+            continue
+        if t is dict:
+            stack.extend(o.values())
+            stack.extend(o.keys())
+        elif t is list or t is tuple or t is set or t is frozenset:
+            stack.extend(o)
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+            stack.extend(o.keys())
+        elif hasattr(o, "__dict__"):
+            stack.append(o.__dict__)
+        elif hasattr(o, "__iter__") and not isinstance(o, (str, bytes, bytearray)):
+            stack.extend(o)
     return size
 
 
@@ -219,23 +310,37 @@ def minimum_string_match(s, valid_strings):
         Otherwise "None" is returned.
 
     """
-    n = len(valid_strings)
-    m = []
-    for i in range(n):
-        if valid_strings[i].find(s) == 0:
-            m.append(i)
-    if len(m) == 1:
-        return valid_strings[m[0]]
-    return None
+    return _prefix_map(tuple(valid_strings)).get(s)
+
+
+@lru_cache(maxsize=128)
+def _prefix_map(valid_strings):
+    """
+    Map every prefix of `valid_strings` that starts exactly one of them to that string.
+
+    Parameters
+    ----------
+    valid_strings : tuple of strings
+        full strings to min match on
+
+    Returns
+    -------
+    dict
+        The unambiguous prefixes and their full strings.
+    """
+    matches = {}
+    for v in valid_strings:
+        for i in range(len(v) + 1):
+            matches.setdefault(v[:i], []).append(v)
+    return {p: m[0] for p, m in matches.items() if len(m) == 1}
 
 
 def uniq(seq):
     """Remove duplicates from a list while preserving order.
-    from http://stackoverflow.com/questions/480214/how-do-you-remove-duplicates-from-a-list-in-python-whilst-preserving-order
+    The elements must be hashable.
     """
-    seen = set()
-    seen_add = seen.add
-    return [x for x in seq if x not in seen and not seen_add(x)]
+    # dicts keep insertion order, so this keeps the first occurrence of each element.
+    return list(dict.fromkeys(seq))
 
 
 def keycase(d, case="upper"):
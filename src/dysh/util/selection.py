@@ -15,6 +15,9 @@ from pandas import DataFrame
 # from ..fits import default_sdfits_columns
 from . import gbt_timestamp_to_time, generate_tag, keycase
 
+# pandas 3 always copies data on write, so shallow copies of a DataFrame do not share changes.
+_PANDAS_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3
+
 default_aliases = {
     "freq": "crval1",
     "ra": "crval2",
@@ -54,8 +57,8 @@ class Selection(DataFrame):
 
          :meth:`select_channel` - Select channels or ranges of channels
 
-    The Selection object maintains a DataFrame for each selection rule created by the user. The
-    :meth:`final` selection is the logical OR of these rules. Users can examine the current selections
+    The Selection object keeps the rows selected by each selection rule created by the user. The
+    :meth:`final` selection is the logical AND of these rules. Users can examine the current selections
     with :meth:`show` which will show the current
     rules and how many rows each rule selects from the unfiltered data.
 
@@ -63,6 +66,22 @@ class Selection(DataFrame):
     Aliases of keywords are supported. The user may add an alias for an existing SDFITS column with :meth:`alias`.   Some default :meth:`aliases` have been defined.
     """
 
+    @property
+    def _constructor(self):
+        """
+        The type of the frames made by pandas operations on a Selection, e.g.,
+        the masking done in the select methods.
+
+        These frames do not have the selection rules, so they are plain DataFrames
+        rather than Selections with their rules silently missing.
+
+        Returns
+        -------
+        type
+            `~pandas.DataFrame`
+        """
+        return DataFrame
+
     def __init__(self, initobj, aliases=default_aliases, **kwargs):
         if hasattr(initobj, "_index"):  # it's an SDFITSLoad object
             super().__init__(initobj._index)
@@ -74,6 +93,7 @@ class Selection(DataFrame):
         # in a UserWarning, which we can safely ignore.
         warnings.simplefilter("ignore", category=UserWarning)
         self._add_utc_column()
+        self._colset_columns = None
         # if we want Selection to replace _index in sdfits
         # construction this will have to change. if hasattr("_index") etc
         self._idtag = ["ID", "TAG"]
@@ -91,9 +111,17 @@ class Selection(DataFrame):
         dt[0] = np.int32
         self._defkeys = DEFKEYS
         self._deftypes = dt
-        self._make_table()
+        # The rows describing each selection rule, keyed by rule ID.
+        self._rule_rows = {}
+        # The IDs of the rules with each tag.
+        self._tag_index = {}
+        self._nextid_counter = 0
         self._valid_coordinates = ["RA", "DEC", "GALLON", "GALLAT", "GLON", "GLAT", "CRVAL2", "CRVAL3"]
+        self._coord_set = frozenset(self._valid_coordinates)
+        # The row labels selected by each rule, keyed by rule ID.
         self._selection_rules = {}
+        # Hashes of the rows selected by each rule, mapped to the IDs of the rules.
+        self._rule_hashes = {}
         self._aliases = {}
         self.alias(aliases)
         self._channel_selection = None
@@ -109,13 +137,40 @@ class Selection(DataFrame):
         -------
         None.
         """
-        self["UTC"] = [gbt_timestamp_to_time(q) for q in self.TIMESTAMP]
+        # Parse all the timestamps at once, then store one Time per row.
+        self["UTC"] = list(gbt_timestamp_to_time(self.TIMESTAMP.to_numpy()))
 
-    def _make_table(self):
-        """Create the table for displaying the selection rules"""
-        self._table = Table(data=None, names=self._defkeys, dtype=self._deftypes)
-        for t in self._idtag:
-            self._table.add_index(t)
+    @property
+    def _colset(self):
+        """
+        The column names as a set, for fast checks of the keywords given to the select methods.
+        It is rebuilt if columns have been added since it was last used.
+
+        Returns
+        -------
+        colset : frozenset
+            The column names.
+        """
+        columns = self.columns
+        if self._colset_columns is not columns:
+            self._colset_cache = frozenset(columns)
+            self._colset_columns = columns
+        return self._colset_cache
+
+    @property
+    def _table(self):
+        """The table for displaying the selection rules, built from the rule rows.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            The selection rules, one per row
+        """
+        if len(self._rule_rows) == 0:
+            return Table(data=None, names=self._defkeys, dtype=self._deftypes)
+        # Columns a rule did not use are left empty.
+        rows = [[row.get(k, "") for k in self._defkeys] for row in self._rule_rows.values()]
+        return Table(rows=rows, names=self._defkeys, dtype=self._deftypes)
 
     @property
     def aliases(self):
@@ -177,15 +232,41 @@ class Selection(DataFrame):
         """
         self._aliases[key.upper()] = column.upper()
 
-    def _set_pprint_exclude_names(self):
+    def _resolve_keys(self, kwargs):
+        """
+        Upper case the keywords of a selection and replace any aliases by the column they refer to.
+
+        Parameters
+        ----------
+        kwargs : dict
+            The key=value pairs of the selection
+
+        Returns
+        -------
+        resolved : list
+            (column, value) tuples, in the order of the keywords
+        """
+        resolved = []
+        for k, v in kwargs.items():
+            ku = k if k.isupper() else k.upper()
+            resolved.append((self._aliases.get(ku, ku), v))
+        return resolved
+
+    def _set_pprint_exclude_names(self, table):
         """Use `~astropy.Table.pprint_exclude_names` to set the list
         columns that have no entries.
+
+        Parameters
+        ----------
+        table : `~astropy.table.Table`
+            The table of selection rules, as returned by `_table`
         """
-        if len(self._table) > 0:
-            emptycols = np.array(self._table.colnames)[
-                [np.all([self._table[k].data[i] == "" for i in range(len(self._table))]) for k in self._table.colnames]
+        if len(table) > 0:
+            # Only string columns can hold empty entries, and each is checked in a single comparison.
+            emptycols = [
+                k for k in table.colnames if table[k].dtype.kind in ("U", "O") and np.all(table[k].data == "")
             ]
-            self._table.pprint_exclude_names.set(emptycols)
+            table.pprint_exclude_names.set(emptycols)
 
     def columns_selected(self):
         """The names of any columns which were used in a selection rule
@@ -195,15 +276,9 @@ class Selection(DataFrame):
         colnames - set
             A set of str column names. An empty set is returned if no selection rule has yet been made.
         """
-        if len(self._table) == 0:
-            return set()
-
-        self._set_pprint_exclude_names()  # ensure __attributes__ gets set.
-        return (
-            set(self._table.colnames)
-            - set(self._table.meta["__attributes__"]["pprint_exclude_names"])
-            - set(["# SELECTED", "ID", "TAG"])
-        )
+        # A column is selected if any rule gave it a value.
+        selected = {k for row in self._rule_rows.values() for k, v in row.items() if v != ""}
+        return selected - set(["# SELECTED", "ID", "TAG"])
 
     def _sanitize_input(self, key, value):
         """
@@ -212,7 +287,7 @@ class Selection(DataFrame):
         Parameters
         ----------
         key : str
-            upper case key value
+            upper case key value, with any alias already resolved (see `_resolve_keys`)
 
         value : any
             The value for the key
@@ -223,11 +298,13 @@ class Selection(DataFrame):
             The sanitized value
         """
         # @todo   Allow minimum match str for key?
-        if key in self._aliases.keys():
-            key = self._aliases[key]
-        if key not in self:
+        if key not in self._colset:
             raise KeyError(f"{key} is not a recognized column name.")
-        v = self._sanitize_coordinates(key, value)
+        # Test for a coordinate here, to skip the call for the other keys.
+        if key in self._coord_set or key in self._aliases:
+            v = self._sanitize_coordinates(key, value)
+        else:
+            v = value
         # deal with Time here or later?
         self._check_for_disallowed_chars(key, value)
         return v
@@ -252,13 +329,16 @@ class Selection(DataFrame):
         sanitized_value : str
             The sanitized value.
         """
-        if key not in self._valid_coordinates and key not in self.aliases:
+        if key not in self._coord_set and key not in self._aliases:
             return value
         # note Quantity is derivative of np.ndarray, so
         # need to filter that out in the recursive call.
         # This is to handle (q1,q2) as a range.
         # (n1,n2)*u.degree is handled below
         if isinstance(value, (tuple, np.ndarray, list)) and not isinstance(value, Quantity):
+            # Plain numbers are converted all at once.
+            if all(isinstance(v, numbers.Number) for v in value):
+                return Angle(np.asarray(value, dtype=float) * u.degree).degree.tolist()
             return [self._sanitize_coordinates(key, v) for v in value]
         if isinstance(value, numbers.Number):
             a = Angle(value * u.degree)
@@ -274,7 +354,7 @@ class Selection(DataFrame):
     def _generate_tag(self, values, hashlen=9):
         """
         Generate a unique tag based on row values.  A hash object is
-        created from the input values using SHA256, and a hex representation is created.
+        created from the input values using BLAKE2b, and a hex representation is created.
         The first `hashlen` characters of the hex string are returned.
 
         Parameters
@@ -297,15 +377,15 @@ class Selection(DataFrame):
         """
         Get the next ID number in the table.
 
+        IDs are handed out in increasing order and are not reused
+        after a rule is removed, until :meth:`clear` is called.
+
         Returns
         -------
         id : int
-            The highest existing ID number plus one
+            The ID number for the next rule
         """
-        ls = len(self._table)
-        if ls == 0:
-            return 0
-        return max(self._table["ID"]) + 1
+        return self._nextid_counter
 
     def _check_keys(self, keys):
         """
@@ -326,12 +406,12 @@ class Selection(DataFrame):
             If one or more keywords are unrecognized
 
         """
-        unrecognized = []
-        ku = [k.upper() for k in keys]
-        for k in ku:
-            if k not in self and k not in self._aliases:
-                unrecognized.append(k)
-        # print("KU, K", ku, k)
+        # Keywords are usually given in upper case already, which needs no new string.
+        ku = [k if k.isupper() else k.upper() for k in keys]
+        # Nearly always every keyword is a column, which a single subset test confirms.
+        if self._colset.issuperset(ku):
+            return
+        unrecognized = [k for k in ku if k not in self._colset and k not in self._aliases]
         if len(unrecognized) > 0:
             raise KeyError(f"The following keywords were not recognized: {unrecognized}")
 
@@ -342,7 +422,7 @@ class Selection(DataFrame):
         bad = []
         badtime = []
         for k, v in kwargs.items():
-            ku = k.upper()
+            ku = k if k.isupper() else k.upper()
             # print(ku)
             if not isinstance(v, (tuple, list, np.ndarray)):
                 raise ValueError(f"Invalid input for key {ku}={v}. Range inputs must be tuple or list.")
@@ -397,31 +477,21 @@ class Selection(DataFrame):
         None or, if silent is True,s a list of keywords that raised errors.
 
         """
-        # deal with potential arrays first by calling
-        # this method recursively on each array member.
-        kw = deepcopy(kwargs)  # prevent concurrent modification
-        recursive_bad = []
+        bad = []
         for k, v in kwargs.items():
             # if the input value is an array, then we want to
             # check the type for each member of the array, but
             # not raise an exception (silent=True) but collect
             # the bad ones and pass them on.
             if isinstance(v, (Sequence, np.ndarray)) and not isinstance(v, str):
-                bad = [self._check_type(reqtype, msg, **{k: x}, silent=True) for x in v]
-                # there's probably a smarter way to do this
-                for i in range(len(bad)):
-                    if len(bad[i]) != 0:
-                        recursive_bad.extend(bad[i])
-                kw.pop(k)
-        # now the main check
-        ku = np.ma.masked_array([k.upper() for k in kw.keys()])
-        ku.mask = np.array([isinstance(x, reqtype) for x in kw.values()])
-        if len(recursive_bad) != 0:
-            ku = np.ma.append(ku, recursive_bad)
+                for x in v:
+                    bad.extend(self._check_type(reqtype, msg, **{k: x}, silent=True))
+            elif not isinstance(v, reqtype):
+                bad.append(k.upper())
         if silent:
-            return list(ku[~ku.mask])
-        if not np.all(ku.mask):
-            raise ValueError(f"{msg}: {np.squeeze(ku[~ku.mask])}")
+            return bad
+        if len(bad) > 0:
+            raise ValueError(f"{msg}: {', '.join(bad)}")
 
     def _check_for_duplicates(self, df):
         """
@@ -443,10 +513,12 @@ class Selection(DataFrame):
         #        ------
         #        Exception
         #            If an identical rule (DataFrame) has already been added.
-        for _id, s in self._selection_rules.items():
-            if s.equals(df):
-                # print(s, df)
-                tag = self._table.loc[_id]["TAG"]
+        # Only rules that selected the same rows can be identical, so only those are compared.
+        rows = np.asarray(df.index)
+        for _id in self._rule_hashes.get(self._rule_hash(rows), []):
+            # Rules select rows of this Selection, so they are identical if they select the same rows.
+            if np.array_equal(self._selection_rules[_id], rows):
+                tag = self._rule_rows[_id]["TAG"]
                 # raise Exception(
                 warnings.warn(
                     f"A rule that results in an identical selection has already been added: ID: {_id}, TAG:{tag}."
@@ -456,6 +528,34 @@ class Selection(DataFrame):
                 # )
         return False
 
+    def _rule_hash(self, rows):
+        """
+        Hash the row labels of a selection rule, which identify the rows it selected.
+
+        Parameters
+        ----------
+        rows : ~numpy.ndarray
+            The row labels of the selection to hash
+
+        Returns
+        -------
+        str
+            The hash string
+        """
+        return self._generate_tag(rows, hashlen=32)
+
+    def _remove_rule(self, id):
+        """
+        Remove a selection rule and its hash.
+
+        Parameters
+        ----------
+        id : int
+            The ID number of the rule
+        """
+        ids = self._rule_hashes[self._rule_hash(self._selection_rules.pop(id))]
+        ids.remove(id)
+
     def _addrow(self, row, dataframe, tag=None):
         """
         Common code to add a tagged row to the internal table after the selection has been created.
@@ -488,9 +588,14 @@ class Selection(DataFrame):
                     gentag.append(f"{k}={v}")
             row["TAG"] = self._generate_tag(gentag)
         row["ID"] = self._next_id
+        self._nextid_counter += 1
         row["# SELECTED"] = len(dataframe)
-        self._selection_rules[row["ID"]] = dataframe
-        self._table.add_row(row)
+        # Only the row labels are kept, the rows themselves are in this Selection.
+        rows = np.asarray(dataframe.index)
+        self._selection_rules[row["ID"]] = rows
+        self._rule_hashes.setdefault(self._rule_hash(rows), []).append(row["ID"])
+        self._rule_rows[row["ID"]] = row
+        self._tag_index.setdefault(row["TAG"], []).append(row["ID"])
 
     def select(self, tag=None, **kwargs):
         """Add one or more exact selection rules, e.g., `key1 = value1, key2 = value2, ...`
@@ -519,41 +624,23 @@ class Selection(DataFrame):
         # if called via _select_from_mixed_kwargs, then we want to merge all the
         # selections
         df = kwargs.pop("startframe", self)
-        for k, v in list(kwargs.items()):
-            ku = k.upper()
-            if ku in self._aliases:
-                ku = self._aliases[ku]
+        for ku, v in self._resolve_keys(kwargs):
             v = self._sanitize_input(ku, v)
             # If a list is passed in, it must be composed of strings.
             # Numeric lists are intepreted as ranges, so must be
             # selected by user with select_range
             if isinstance(v, (Sequence, np.ndarray)) and not isinstance(v, str):
-                # print(ku, v)
-                query = None
-                for vv in v:
-                    if ku == "UTC":
+                if ku == "UTC":
+                    for vv in v:
                         self._check_type(
                             Time,
                             "Expected Time object but got something else.",
                             **{ku: vv},
                         )
-                    # if it is a string, then OR them.
-                    # e.g. object = ["NGC123", "NGC234"]
-                    if isinstance(vv, str):
-                        thisq = f'{ku} == "{vv}"'
-                    else:
-                        thisq = f"{ku} == {vv}"
-                    if query is None:
-                        query = thisq
-                    else:
-                        query += f"| {thisq}"
-                    # for pd.merge to give the correct answer, we would
-                    # need "inner" on the first one and "outer" on subsequent
-                    # df = pd.merge(df, df[df[ku] == vv], how="inner")
-                # print("final query ", query)
-                df = df.query(query)
+                # Match any of the values, e.g. object = ["NGC123", "NGC234"]
+                df = df[df[ku].isin(list(v))]
             else:
-                df = pd.merge(df, df[df[ku] == v], how="inner")
+                df = df[df[ku] == v]
             row[ku] = str(v)
         if df.empty:
             warnings.warn("Your selection rule resulted in no data being selected. Ignoring.")
@@ -594,10 +681,7 @@ class Selection(DataFrame):
         self._check_range(**kwargs)
         row = {}
         df = self
-        for k, v in list(kwargs.items()):
-            ku = k.upper()
-            if ku in self._aliases:
-                ku = self._aliases[ku]
+        for ku, v in self._resolve_keys(kwargs):
             v = self._sanitize_input(ku, v)
             # print(f"{ku}={v}")
             # deal with a tuple quantity
@@ -616,16 +700,22 @@ class Selection(DataFrame):
             v = vn
             row[ku] = str(v)
             if len(v) == 2:
+                # Catch bounds that cannot select anything, or that select everything,
+                # before comparing the whole column.
+                if v[0] is None and v[1] is None:
+                    continue
+                if v[0] is not None and v[1] is not None and v[0] > v[1]:
+                    raise ValueError(f"Lower limit {v[0]} is greater than upper limit {v[1]} for key {ku}.")
                 if v[0] is not None and v[1] is not None:
-                    df = pd.merge(df, df[(df[ku] <= v[1]) & (df[ku] >= v[0])], how="inner")
+                    df = df[(df[ku] <= v[1]) & (df[ku] >= v[0])]
                 elif v[0] is None:  # upper limit given
-                    df = pd.merge(df, df[(df[ku] <= v[1])], how="inner")
+                    df = df[(df[ku] <= v[1])]
                 else:  # lower limit given (v[1] is None)
-                    df = pd.merge(df, df[(df[ku] >= v[0])], how="inner")
+                    df = df[(df[ku] >= v[0])]
             elif len(v) == 1:  # lower limit given
-                df = pd.merge(df, df[(df[ku] >= v[0])], how="inner")
+                df = df[(df[ku] >= v[0])]
             else:
-                raise Exception(f"Couldn't parse value tuple {v} for key {k} as a range.")
+                raise Exception(f"Couldn't parse value tuple {v} for key {ku} as a range.")
         if df.empty:
             warnings.warn("Your selection rule resulted in no data being selected. Ignoring.")
             return
@@ -723,32 +813,30 @@ class Selection(DataFrame):
             raise Exception("You must specify either id or tag")
         if id is not None:
             if id in self._selection_rules:
-                # We will assume that selection_rules and table
+                # We will assume that selection_rules and rule_rows
                 # have been kept in sync.  The implementation
                 # should ensure this.
-                del self._selection_rules[id]
-                row = self._table.loc_indices["ID", id]
-                # there is only one row per ID
-                self._table.remove_row(row)
+                self._remove_rule(id)
+                ids = self._tag_index[self._rule_rows.pop(id)["TAG"]]
+                ids.remove(id)
             else:
                 raise KeyError(f"No ID = {id} found in this Selection")
         else:
             # need to find IDs of selection rules where TAG == tag.
-
-            # This will raise keyerror if tag not matched, so no need
-            # to raise our own, unless we want to change the messgae.
-            matching_indices = self._table.loc_indices["TAG", tag]
-            #   raise KeyError(f"No TAG = {tag} found in this Selection")
-            matching = Table(self._table[matching_indices])
-            for i in matching["ID"]:
-                del self._selection_rules[i]
-                # self._selection_rules.pop(i, None) # also works
-            self._table.remove_rows(matching_indices)
+            matching = self._tag_index.pop(tag, [])
+            if len(matching) == 0:
+                raise KeyError(f"No TAG = {tag} found in this Selection")
+            for i in matching:
+                self._remove_rule(i)
+                del self._rule_rows[i]
 
     def clear(self):
         """Remove all selection rules"""
         self._selection_rules = {}
-        self._make_table()
+        self._rule_hashes = {}
+        self._nextid_counter = 0
+        self._rule_rows = {}
+        self._tag_index = {}
 
     def show(self):
         """
@@ -764,21 +852,28 @@ class Selection(DataFrame):
         None.
 
         """
-        self._set_pprint_exclude_names()
-        print(self._table)
+        table = self._table
+        self._set_pprint_exclude_names(table)
+        print(table)
 
     @property
     def final(self):
         """
         Create the final selection. This is done by a logical AND of each
-        of the selection rules (specifically `pandas.merge(how='inner')`).
+        of the selection rules (specifically the rows which every rule selected).
 
         Returns
         -------
         final : DataFrame
             The resultant selection from all the rules.
         """
-        return self.merge(how="inner")
+        if len(self._selection_rules) == 0:
+            return DataFrame()
+        # The rules are row labels of this Selection, so mask the rows common to all rules and take them once.
+        keep = np.ones(len(self), dtype=bool)
+        for rows in self._selection_rules.values():
+            keep &= self.index.isin(rows)
+        return self.loc[keep].reset_index(drop=True)
 
     def merge(self, how, on=None):
         """
@@ -805,13 +900,10 @@ class Selection(DataFrame):
             # warnings.warn("Selection.merge(): upselecting now")
             return DataFrame()
         final = None
-        for df in self._selection_rules.values():
+        for rows in self._selection_rules.values():
+            df = self.loc[rows]
             if final is None:
-                # need a deepcopy here in case there
-                # is only one selection rule, because
-                # we don't want to return a reference to the rule
-                # which the receiver might modify.
-                final = deepcopy(df)
+                final = df.reset_index(drop=True)
             else:
                 final = pd.merge(final, df, how=how, on=on)
         return final
@@ -851,6 +943,36 @@ class Selection(DataFrame):
                 print(f"selection {ukwargs}")
             self.select(**ukwargs, tag=tag)
 
+    def _copy_rules(self):
+        """
+        Copy this Selection for adding further selection rules. The row data and the
+        selection rules are both copied, so neither changes to the data of the copy nor
+        rules added to it affect this Selection. With pandas >= 3, which always copies on write,
+        the columns are only copied if they are changed.
+        This is cheaper than a deep copy, which also copies every Python object in the columns.
+
+        Returns
+        -------
+        selection : `Selection`
+            The copy.
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        # Let pandas copy the row data, without running Selection.__init__ again.
+        # Before pandas 3 a shallow copy shares the column buffers, so they must be copied.
+        DataFrame.__init__(result, self, copy=not _PANDAS_COPY_ON_WRITE)
+        # The Selection attributes are shared, except for pandas' own state, which was set above.
+        for k, v in self.__dict__.items():
+            result.__dict__.setdefault(k, v)
+        # The column set is rebuilt for the columns of the copy on first use.
+        result.__dict__["_colset_columns"] = None
+        result.__dict__["_rule_rows"] = dict(self._rule_rows)
+        result.__dict__["_tag_index"] = {k: list(v) for k, v in self._tag_index.items()}
+        result.__dict__["_selection_rules"] = dict(self._selection_rules)
+        result.__dict__["_rule_hashes"] = {k: list(v) for k, v in self._rule_hashes.items()}
+        result.__dict__["_aliases"] = dict(self._aliases)
+        return result
+
     def __deepcopy__(self, memo):
         warnings.simplefilter("ignore", category=UserWarning)
         cls = self.__class__
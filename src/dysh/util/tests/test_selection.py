@@ -1,6 +1,7 @@
 import pathlib
 
 import astropy.units as u
+import pandas as pd
 import pytest
 from astropy.time import Time
 
@@ -40,6 +41,7 @@ class TestSelection:
         # the AND of the selection rules becomes the final
         # selection
         assert len(s.final) == 3
+        assert s.final.equals(s.merge(how="inner"))
 
         # test s.remove by both id and tag
         s.remove(0)
@@ -49,6 +51,8 @@ class TestSelection:
         # This has the same final result than selections on separate lines
         s.select(object="NGC2415", plnum=0, ifnum=[0, 2])
         assert len(s.final) == 3
+        # IDs of removed rules are not reused.
+        assert list(s._selection_rules) == [2]
         s.clear()
 
         # test select_range
@@ -58,6 +62,7 @@ class TestSelection:
         # s = Selection(sdf)
         s.select_range(ra=(114,))  # default is degrees
         assert len(s.final) == 40
+        assert list(s._selection_rules) == [0]
         # check that quantities work
         s.select_range(dec=[2400, 7500] * u.arcmin)
         assert len(s.final) == 20
@@ -65,6 +70,12 @@ class TestSelection:
         s.clear()
         s.select_range(ra=(114,), dec=[2400, 7500] * u.arcmin)
         assert len(s.final) == 20
+        # swapped limits are an error, and no limits select everything
+        with pytest.raises(ValueError):
+            s.select_range(ra=(200, 114))
+        s.clear()
+        s.select_range(ifnum=(None, None))
+        assert len(s.final) == len(s)
         # test select_within
         s.clear()
         # also verify that the selection variable name is
@@ -87,3 +98,59 @@ class TestSelection:
         assert len(s.final) == len(s)
         with pytest.raises(Exception):
             s.select_channel(["10", "a", 103])
+
+    def test_copy_rules(self):
+        """
+        Test that rules added to a Selection from `_copy_rules` do not change the original.
+        """
+        sdf = gbtfitsload.GBTFITSLoad(self.file)
+        s = sdf._selection
+        s.select(plnum=0)
+        c = s._copy_rules()
+        c.select(ifnum=[0, 2])
+        assert len(s._selection_rules) == 1
+        assert len(s._table) == 1
+        assert len(c._selection_rules) == 2
+        assert len(c._table) == 2
+        assert len(c.final) < len(s.final)
+        assert len(c) == len(s)
+        # Changing the data of the copy does not change the original.
+        scan = s.loc[0, "SCAN"]
+        c.loc[0, "SCAN"] = 9999
+        assert s.loc[0, "SCAN"] == scan
+
+    def test_derived_frames(self):
+        """
+        Test that frames made by pandas operations on a Selection are plain DataFrames without the rules.
+        """
+        sdf = gbtfitsload.GBTFITSLoad(self.file)
+        s = sdf._selection
+        s.select(plnum=0)
+        for df in [s[s["PLNUM"] == 0], s.loc[0:4], s.copy(), s.final]:
+            assert type(df) is pd.DataFrame
+            assert not hasattr(df, "_selection_rules")
+
+    def test_duplicate_rules(self):
+        """
+        Test that rules selecting the same rows are detected as duplicates, however they were made.
+        """
+        sdf = gbtfitsload.GBTFITSLoad(self.file)
+        s = sdf._selection
+        s.select(scan=152)
+        with pytest.warns(UserWarning):
+            s.select_range(scan=(152, 152))
+        assert len(s._selection_rules) == 1
+        # Once removed, the same rule can be added again.
+        s.remove(0)
+        s.select_range(scan=(152, 152))
+        assert list(s._selection_rules) == [1]
+        s.select(scan=155)
+        assert len(s._selection_rules) == 2
+        # All rules sharing a tag are removed together.
+        s.select(plnum=0, tag="shared")
+        s.select(ifnum=[0, 2], tag="shared")
+        assert len(s._selection_rules) == 4
+        s.remove(tag="shared")
+        assert list(s._selection_rules) == [1, 2]
+        with pytest.raises(KeyError):
+            s.remove(tag="shared")
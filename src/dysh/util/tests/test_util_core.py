@@ -1,4 +1,7 @@
+import sys
+
 import numpy as np
+import pandas as pd
 
 import dysh.util as du
 
@@ -18,6 +21,11 @@ class TestUtil:
         result = np.sqrt(u / ws)
         diff = result - du.sq_weighted_avg(a, 0, w)
         assert np.abs(diff) < 2e-15
+        # Unweighted and along other axes.
+        b = np.random.rand(3, 16, 4)
+        assert np.allclose(du.sq_weighted_avg(b, 1), np.sqrt(np.mean(b * b, axis=1)))
+        wb = np.random.rand(16)
+        assert np.allclose(du.sq_weighted_avg(b, 1, wb), np.sqrt(np.average(b * b, axis=1, weights=wb)))
 
     def test_match(self):
         """Test minimum_string_match function"""
@@ -28,9 +36,70 @@ class TestUtil:
         assert du.minimum_string_match("ga", s) == "gamma"
         assert du.minimum_string_match("am", s) == None
 
+    def test_select_from(self):
+        """Test select_from function"""
+        df = pd.DataFrame({"SCAN": [1, 2, 1, 3], "CAL": ["T", "F", "F", "T"]}, index=[10, 11, 12, 13])
+        assert list(du.select_from("SCAN", 1, df).index) == [10, 12]
+        assert list(du.select_from("CAL", "T", df).index) == [10, 13]
+        assert du.select_from("CAL", "X", df).empty
+
     def test_powerof2(self):
         """Test powerof2 function"""
         inout = {2**0: 0, 2**15: 15, 2**15.49: 15, 2**15.5: 16}
 
         for k, v in inout.items():
             assert du.powerof2(k) == v
+
+    def test_get_size(self):
+        """Test get_size function"""
+        d = {"a": 1.5, "b": "text"}
+        expected = sum(sys.getsizeof(x) for x in [d, "a", 1.5, "b", "text"])
+        assert du.get_size(d) == expected
+        # Shared and self-referential objects are counted once.
+        x = [d, d]
+        x.append(x)
+        assert du.get_size(x) == sys.getsizeof(x) + expected
+        # Deep nesting does not hit the recursion limit.
+        deep = []
+        for i in range(2 * sys.getrecursionlimit()):
+            deep = [deep]
+        assert du.get_size(deep) > 0
+
+    def test_generate_tag(self):
+        """Test generate_tag function"""
+        values = ["SCAN", 152, 0.5]
+        tag = du.generate_tag(values, 9)
+        assert len(tag) == 9
+        assert tag == du.generate_tag(list(values), 9)
+        assert tag != du.generate_tag(["SCAN", 153, 0.5], 9)
+        assert len(du.generate_tag(values, 200)) == 128
+        a = np.arange(10)
+        assert du.generate_tag(a, 9) == du.generate_tag(a.copy(), 9)
+        assert du.generate_tag(a, 9) != du.generate_tag(a[::-1], 9)
+        # Object arrays are hashed by value, not by the addresses they hold.
+        o1 = np.array(["SCAN", 1520], dtype=object)
+        o2 = np.array(["".join(["SC", "AN"]), int("1520")], dtype=object)
+        assert du.generate_tag(o1, 9) == du.generate_tag(o2, 9)
+
+    def test_consecutive(self):
+        """Test consecutive and iter_consecutive functions"""
+        data = np.array([1, 2, 3, 7, 8, 20])
+        groups = du.consecutive(data, stepsize=2)
+        assert [list(g) for g in groups] == [[1, 2, 3], [7, 8], [20]]
+        assert list(du.iter_consecutive(data, stepsize=2)) == [(0, 3), (3, 5), (5, 6)]
+        assert [list(g) for g in du.consecutive(data[:1])] == [[1]]
+
+    def test_uniq(self):
+        """Test uniq function"""
+        assert du.uniq([3, 1, 3, 2, 1]) == [3, 1, 2]
+        assert du.uniq(np.array([152, 152, 153])) == [152, 153]
+        assert du.uniq([]) == []
+
+    def test_gbt_timestamp_to_time(self):
+        """Test gbt_timestamp_to_time function"""
+        t = du.gbt_timestamp_to_time("2021_02_10_07:38:37")
+        assert t.isot == "2021-02-10T07:38:37.000"
+        ta = du.gbt_timestamp_to_time(np.array(["2021_02_10_07:38:37", "2021_02_10_07:39:07.5"]))
+        assert ta.shape == (2,)
+        assert ta[0] == t
+        assert ta[1].isot == "2021-02-10T07:39:07.500"